@@ -23,3 +23,31 @@ class SkillApplicationAdmin(admin.ModelAdmin):
     list_filter = ('status', 'created_at')
     readonly_fields = ('created_at', 'updated_at')
     search_fields = ('applicant__username', 'skill__title')
+
+
+@admin.register(models.OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ('to_email', 'subject', 'status', 'attempts', 'created_at', 'sent_at')
+    list_filter = ('status', 'created_at')
+    readonly_fields = ('created_at', 'sent_at', 'claimed_at')
+    search_fields = ('to_email', 'subject')
+
+
+@admin.register(models.PendingNotification)
+class PendingNotificationAdmin(admin.ModelAdmin):
+    list_display = ('to_email', 'action', 'skill_title', 'created_at')
+    list_filter = ('action', 'created_at')
+    search_fields = ('to_email', 'skill_title')
+
+
+@admin.register(models.Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ('name', 'created_at')
+    search_fields = ('name',)
+
+
+@admin.register(models.RevokedToken)
+class RevokedTokenAdmin(admin.ModelAdmin):
+    list_display = ('jti', 'expires_at', 'revoked_at')
+    readonly_fields = ('revoked_at',)
+    search_fields = ('jti',)
@@ -1,20 +1,85 @@
 from rest_framework import status, generics, permissions
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import TokenError
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db.models import Q
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count
+from django.http import StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from .serializers import (
     UserSerializer, UserProfileSerializer, SignUpSerializer, 
-    LoginSerializer, SkillSerializer, SkillApplicationSerializer
+    LoginSerializer, SkillSerializer, SkillApplicationSerializer,
+    CompactSkillApplicationSerializer
 )
 from .models import UserProfile, Skill, SkillApplication
+from .budgets import query_budget
+from .applications import (
+    InvalidTransition, StaleTransition, allowed_roles, bulk_transition, count_new_application,
+    status_counts, transition_application
+)
+from .idempotency import idempotent
+from .geo import InvalidGeoQuery, nearest, parse_near_params
+from .bulk import export_ndjson, import_ndjson
+from .notifications import build_notification, digest_window, record_notification
+from .outbox import enqueue_email
+from .caching import (
+    browse_cache_key, browse_cache_timeout, entry_response, make_etag,
+    normalize_filters, not_modified, user_cache_key, validator_headers,
+    versioned_entry
+)
+from .matching import find_matches, matched_tokens, tag_filter
+from .pagination import InvalidCursor, approximate_count, get_page_size, paginate_keyset
+from .search import search_skills
+from .throttling import LOGIN_THROTTLES, SIGNUP_THROTTLES
+from .tokens import RefreshToken
+from .typeahead import autocomplete
+from .streaming import iter_json_array, iter_json_object, streaming_json_response, wants_stream
+
+
+def user_profile(user):
+    """The user's profile or None, already loaded when CachedJWTAuthentication cached the user"""
+    try:
+        return user.userprofile
+    except UserProfile.DoesNotExist:
+        return None
+
+
+def filter_skills(skills, params):
+    """Apply the category/location/proficiency/availability/search/wants/offers browse filters"""
+    category = params.get('category')
+    location = params.get('location')
+    proficiency = params.get('proficiency')
+    availability = params.get('availability')
+    search = params.get('search')
+    wants = params.get('wants')
+    offers = params.get('offers')
+    
+    if category:
+        skills = skills.filter(category__icontains=category)
+    if location:
+        skills = skills.filter(location__icontains=location)
+    if proficiency:
+        skills = skills.filter(proficiency=proficiency)
+    if availability:
+        skills = skills.filter(availability=availability)
+    if search:
+        skills = search_skills(skills, search)
+    # Tag filters are indexed joins on SkillTag, e.g. wants=python,react
+    if wants:
+        skills = tag_filter(skills, 'wanted', wants)
+    if offers:
+        skills = tag_filter(skills, 'offered', offers)
+    return skills
 
 
+# Throttled before the view runs, so rejected bursts never reach password hashing
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes(SIGNUP_THROTTLES)
 @csrf_exempt
 def signup_api(request):
     """API endpoint for user registration"""
@@ -33,6 +98,7 @@ def signup_api(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes(LOGIN_THROTTLES)
 @csrf_exempt
 def login_api(request):
     """API endpoint for user login"""
@@ -56,43 +122,135 @@ def logout_api(request):
     try:
         refresh_token = request.data.get('refresh')
         if refresh_token:
+            # Revoked in core.tokens, refreshing with it fails from now on
             token = RefreshToken(refresh_token)
             token.blacklist()
         return Response({'message': 'Logout successful'}, status=status.HTTP_200_OK)
-    except Exception as e:
+    except TokenError:
         return Response({'error': 'Invalid token'}, status=status.HTTP_400_BAD_REQUEST)
 
 
+def browse_queryset(params):
+    """Active skills matching the browse filters, best full-text matches first"""
+    # Get all active skills for browsing - no authentication required
+    skills = filter_skills(
+        Skill.objects.filter(is_active=True).select_related('user'), params
+    )
+    
+    # Rank full-text matches by relevance when the search index was used
+    if 'search_rank' in skills.query.annotations:
+        skills = skills.order_by('-search_rank', '-created_at')
+    return skills
+
+
+def browse_skills(params):
+    """Serialized /skills/ browse response for a query dict, raises InvalidCursor/InvalidGeoQuery"""
+    skills = browse_queryset(params)
+    
+    # Nearest-first within a radius of near=<lat,lng or city>, raises InvalidGeoQuery
+    if 'near' in params:
+        latitude, longitude, radius, k = parse_near_params(params)
+        results = []
+        for skill, distance in nearest(skills, latitude, longitude, radius, k):
+            data = SkillSerializer(skill).data
+            data['distance_km'] = round(distance, 2)
+            results.append(data)
+        return results
+    
+    # Keyset-paginated mode is opt-in so existing clients keep getting a plain list
+    if 'cursor' in params or 'page_size' in params:
+        page, next_cursor, page_size = paginate_keyset(skills, params)
+        data = {
+            'results': SkillSerializer(page, many=True).data,
+            'next_cursor': next_cursor,
+            'page_size': page_size,
+        }
+        if params.get('include_total') in ('1', 'true', 'approx'):
+            data['total'], data['total_is_exact'] = approximate_count(skills)
+        return data
+    
+    return SkillSerializer(skills, many=True).data
+
+
+FACET_FIELDS = ('category', 'proficiency', 'availability')
+
+
+def skill_facets(params):
+    """Counts per category/proficiency/availability value for a browse filter set"""
+    facets = {}
+    for field in FACET_FIELDS:
+        # A facet ignores its own filter so the other values stay selectable
+        others = {name: value for name, value in params.items() if name != field}
+        rows = (
+            filter_skills(Skill.objects.filter(is_active=True), others)
+            .order_by()
+            .values(field)
+            .annotate(count=Count('id'))
+        )
+        facets[field] = sorted(
+            ({'value': row[field], 'count': row['count']} for row in rows),
+            key=lambda facet: (-facet['count'], facet['value']),
+        )
+    return facets
+
+
 # Skill Management APIs
+@query_budget(2)
 @api_view(['GET', 'POST'])
 @permission_classes([AllowAny])  # Allow anyone to browse skills, but require auth for POST
 def skills_api(request):
     """API endpoint for skill listing and creation"""
     if request.method == 'GET':
-        # Get all active skills for browsing - no authentication required
-        skills = Skill.objects.filter(is_active=True).select_related('user')
-        
-        # Apply filters
-        category = request.GET.get('category')
-        location = request.GET.get('location')
-        proficiency = request.GET.get('proficiency')
-        search = request.GET.get('search')
+        # Filter from the normalized parameters so that everything sharing a
+        # cache key also shares a result
+        params = normalize_filters(request.GET)
         
-        if category:
-            skills = skills.filter(category__icontains=category)
-        if location:
-            skills = skills.filter(location__icontains=location)
-        if proficiency:
-            skills = skills.filter(proficiency=proficiency)
-        if search:
-            skills = skills.filter(
-                Q(title__icontains=search) | 
-                Q(description__icontains=search) |
-                Q(skills_wanted__icontains=search)
+        # Keyset pages follow (-created_at, -id), which would silently replace
+        # the relevance order of a search, so the two don't mix
+        if 'search' in params and {'cursor', 'page_size'} & params.keys() and 'near' not in params:
+            return Response(
+                {'error': 'search results are ranked by relevance and cannot be paged with cursor/page_size'},
+                status=status.HTTP_400_BAD_REQUEST
             )
         
-        serializer = SkillSerializer(skills, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # Opt-in streaming of the full list, row by row off a server-side
+        # cursor; pages are already bounded so they keep the cached path
+        if wants_stream(request.GET) and not {'cursor', 'page_size', 'near'} & params.keys():
+            return streaming_json_response(iter_json_array(browse_queryset(params), SkillSerializer))
+        
+        # near=me searches around the signed-in user's geocoded profile location
+        if params.get('near') == 'me' and request.user.is_authenticated:
+            profile = user_profile(request.user)
+            if profile is None or profile.latitude is None:
+                return Response({'error': 'Your profile location could not be geocoded'}, status=status.HTTP_400_BAD_REQUEST)
+            params['near'] = f'{profile.latitude},{profile.longitude}'
+        
+        # Anonymous browsing is served from the versioned response cache
+        if not request.user.is_authenticated:
+            cache_key, etag = browse_cache_key(params)
+            headers = validator_headers(etag, cache_control='no-cache')
+            response = not_modified(request, etag, cache_control='no-cache')
+            if response is not None:
+                return response
+            
+            data = cache.get(cache_key)
+            if data is None:
+                try:
+                    data = browse_skills(params)
+                except InvalidCursor:
+                    return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+                except InvalidGeoQuery as e:
+                    return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+                cache.set(cache_key, data, browse_cache_timeout())
+            return Response(data, status=status.HTTP_200_OK, headers=headers)
+        
+        try:
+            data = browse_skills(params)
+        except InvalidCursor:
+            return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+        except InvalidGeoQuery as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data, status=status.HTTP_200_OK)
     
     elif request.method == 'POST':
         # Create new skill - temporarily allow for development
@@ -124,6 +282,31 @@ def skills_api(request):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@query_budget(len(FACET_FIELDS))
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def skill_facets_api(request):
+    """API endpoint for facet counts of the current browse filters"""
+    # Same filters as skills_api, minus the paging and nearest-first parameters
+    params = {
+        name: value for name, value in normalize_filters(request.GET).items()
+        if name not in ('cursor', 'page_size', 'include_total', 'near', 'radius', 'k')
+    }
+    # Counts are the same for every user, so everyone shares the cache
+    cache_key, etag = browse_cache_key(params, kind='facets', counters=False)
+    response = not_modified(request, etag, cache_control='no-cache')
+    if response is not None:
+        return response
+    
+    data = cache.get(cache_key)
+    if data is None:
+        data = {'filters': params, 'facets': skill_facets(params)}
+        cache.set(cache_key, data, browse_cache_timeout())
+    headers = validator_headers(etag, cache_control='no-cache')
+    return Response(data, status=status.HTTP_200_OK, headers=headers)
+
+
+@query_budget(2)
 @api_view(['GET'])
 @permission_classes([AllowAny])  # Temporarily allow access for development
 def my_skills_api(request):
@@ -138,25 +321,63 @@ def my_skills_api(request):
     else:
         user = request.user
     
-    skills = Skill.objects.filter(user=user, is_active=True)
-    serializer = SkillSerializer(skills, many=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    if wants_stream(request.GET):
+        skills = Skill.objects.filter(user=user, is_active=True)
+        return streaming_json_response(iter_json_array(skills, SkillSerializer))
+    
+    return entry_response(request, my_skills_entry(user))
+
+
+def my_skills_entry(user):
+    """The cached versioned_entry for a user's active skills, one query on a miss"""
+    # Versioned per user, any write to one of their skills orphans the entry
+    cache_key = user_cache_key('mine', user.id)
+    entry = cache.get(cache_key)
+    if entry is None:
+        skills = list(SkillSerializer.setup_eager_loading(Skill.objects.filter(user=user, is_active=True)))
+        # The ETag comes from the rows themselves: newest updated_at plus the
+        # row count, so a soft-delete changes it too, plus the application
+        # counters, which change without touching updated_at. No
+        # Last-Modified: soft-deleting the newest skill would move it back.
+        latest = max((skill.updated_at for skill in skills), default=None)
+        counters = ','.join(f'{skill.id}:{skill.application_count}:{skill.pending_count}' for skill in skills)
+        entry = versioned_entry(
+            SkillSerializer(skills, many=True).data,
+            make_etag(user.id, latest.isoformat() if latest else '', len(skills), counters),
+        )
+        cache.set(cache_key, entry, browse_cache_timeout())
+    return entry
 
 
+@query_budget(2)
 @api_view(['GET', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticated])
 def skill_detail_api(request, skill_id):
     """API endpoint for skill detail operations"""
+    if request.method == 'GET':
+        cache_key = user_cache_key('detail', request.user.id, skill_id)
+        entry = cache.get(cache_key)
+        if entry is None:
+            try:
+                skill = Skill.objects.select_related('user').get(id=skill_id, user=request.user)
+            except Skill.DoesNotExist:
+                return Response({'error': 'Skill not found'}, status=status.HTTP_404_NOT_FOUND)
+            entry = versioned_entry(
+                SkillSerializer(skill).data,
+                make_etag(skill.id, skill.updated_at.isoformat(), skill.application_count, skill.pending_count),
+                int(skill.updated_at.timestamp()),
+            )
+            cache.set(cache_key, entry, browse_cache_timeout())
+        return entry_response(request, entry)
+    
     try:
-        skill = Skill.objects.get(id=skill_id, user=request.user)
+        skill = Skill.objects.select_related('user').get(id=skill_id, user=request.user)
     except Skill.DoesNotExist:
         return Response({'error': 'Skill not found'}, status=status.HTTP_404_NOT_FOUND)
     
-    if request.method == 'GET':
-        serializer = SkillSerializer(skill)
-        return Response(serializer.data)
-    
-    elif request.method == 'PUT':
+    # PUT and DELETE save the skill, core.signals then bumps the owner's
+    # cache version so cached my-skills and detail entries are dropped
+    if request.method == 'PUT':
         serializer = SkillSerializer(skill, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
@@ -169,9 +390,115 @@ def skill_detail_api(request, skill_id):
         return Response({'message': 'Skill deleted successfully'}, status=status.HTTP_200_OK)
 
 
+# Lookups are served from memory; the one allowed query is the occasional
+# catch-up after skills were written by another worker
+@query_budget(1)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def autocomplete_skills_api(request):
+    """API endpoint for search-box suggestions from skill titles, categories and tags"""
+    query = request.GET.get('q', '')
+    max_limit = getattr(settings, 'TYPEAHEAD_MAX_LIMIT', 25)
+    try:
+        limit = max(1, min(int(request.GET.get('limit', getattr(settings, 'TYPEAHEAD_LIMIT', 10))), max_limit))
+    except ValueError:
+        return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'query': query, 'results': autocomplete(query, limit)}, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def import_skills_api(request):
+    """API endpoint for bulk importing the current user's skills from NDJSON"""
+    # Read the body line by line instead of through request.data, so a large
+    # upload is never parsed into memory as a whole
+    lines = request.stream or []
+    result = import_ndjson(lines, request.user)
+    if result.created:
+        response_status = status.HTTP_201_CREATED
+    elif result.failed:
+        response_status = status.HTTP_400_BAD_REQUEST
+    else:
+        response_status = status.HTTP_200_OK
+    return Response(result.as_dict(), status=response_status)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def export_skills_api(request):
+    """API endpoint for streaming active skills as NDJSON"""
+    skills = filter_skills(Skill.objects.filter(is_active=True), normalize_filters(request.GET))
+    response = StreamingHttpResponse(
+        export_ndjson(skills.order_by('id')), content_type='application/x-ndjson'
+    )
+    response['Content-Disposition'] = 'attachment; filename="skills.ndjson"'
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def similar_skills_api(request, skill_id):
+    """API endpoint for content-based similar skills"""
+    # Imported here so scikit-learn only loads in workers that serve this endpoint
+    from .similarity import similar_skills
+    
+    if not Skill.objects.filter(id=skill_id, is_active=True).exists():
+        return Response({'error': 'Skill not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    max_k = getattr(settings, 'SIMILAR_SKILLS_MAX_K', 50)
+    try:
+        k = max(1, min(int(request.GET.get('k', 10)), max_k))
+    except ValueError:
+        return Response({'error': 'k must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    results = []
+    for skill, score in similar_skills(skill_id, k):
+        data = SkillSerializer(skill).data
+        data['similarity'] = round(score, 4)
+        results.append(data)
+    return Response({'skill_id': skill_id, 'results': results}, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def swap_matches_api(request):
+    """API endpoint for users with a mutual skill swap: they offer what you want and want what you offer"""
+    matches, offered, wanted = find_matches(request.user)
+    
+    page_size = get_page_size(request.GET)
+    try:
+        page = max(1, int(request.GET.get('page', 1)))
+    except ValueError:
+        return Response({'error': 'page must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    page_matches = matches[(page - 1) * page_size:page * page_size]
+    
+    user_ids = [user_id for user_id, _, _ in page_matches]
+    users = User.objects.in_bulk(user_ids)
+    tokens = matched_tokens(user_ids, offered, wanted)
+    results = [
+        {
+            'user': UserSerializer(users[user_id]).data,
+            'score': min(they_offer, they_want),
+            'they_offer': tokens[user_id]['they_offer'],
+            'they_want': tokens[user_id]['they_want'],
+        }
+        for user_id, they_offer, they_want in page_matches
+        if user_id in users
+    ]
+    return Response({
+        'count': len(matches),
+        'page': page,
+        'page_size': page_size,
+        'results': results
+    }, status=status.HTTP_200_OK)
+
+
 # Application Management APIs
+# User, skill, then BEGIN / INSERT / counter UPDATE / COMMIT
+@query_budget(6, methods=('POST',))
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@idempotent('apply')
 def apply_skill_api(request):
     """API endpoint for applying to a skill"""
     skill_id = request.data.get('skill_id')
@@ -179,24 +506,28 @@ def apply_skill_api(request):
     offering_skill = request.data.get('offering_skill', '')
     
     try:
-        skill = Skill.objects.get(id=skill_id, is_active=True)
-        if skill.user == request.user:
+        skill = Skill.objects.select_related('user').get(id=skill_id, is_active=True)
+        if skill.user_id == request.user.id:
             return Response({'error': 'Cannot apply to your own skill'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Check if already applied
-        existing_application = SkillApplication.objects.filter(
-            skill=skill, applicant=request.user, status='pending'
-        ).first()
-        
-        if existing_application:
-            return Response({'error': 'Already applied to this skill'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        application = SkillApplication.objects.create(
-            skill=skill,
-            applicant=request.user,
-            message=message,
-            offering_skill=offering_skill
-        )
+        # No duplicate check up front: the unique_pending_application
+        # constraint rejects a second pending application, even when two
+        # requests race
+        try:
+            with transaction.atomic():
+                application = SkillApplication.objects.create(
+                    skill=skill,
+                    applicant=request.user,
+                    message=message,
+                    offering_skill=offering_skill
+                )
+                count_new_application(skill)
+        except IntegrityError:
+            # Backends don't name the violated constraint portably, so confirm
+            # it was unique_pending_application before calling it a duplicate
+            if SkillApplication.objects.filter(skill=skill, applicant=request.user, status='pending').exists():
+                return Response({'error': 'Already applied to this skill'}, status=status.HTTP_400_BAD_REQUEST)
+            raise
         
         serializer = SkillApplicationSerializer(application)
         return Response({
@@ -208,15 +539,22 @@ def apply_skill_api(request):
         return Response({'error': 'Skill not found'}, status=status.HTTP_404_NOT_FOUND)
 
 
+@query_budget(3)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def my_applications_api(request):
     """API endpoint for getting user's applications"""
-    # Applications sent by user
-    sent_applications = SkillApplication.objects.filter(applicant=request.user).select_related('skill', 'skill__user')
+    # Applications sent by user (SkillApplicationSerializer adds the joins it needs)
+    sent_applications = SkillApplication.objects.filter(applicant=request.user)
     
     # Applications received for user's skills
-    received_applications = SkillApplication.objects.filter(skill__user=request.user).select_related('applicant', 'skill')
+    received_applications = SkillApplication.objects.filter(owner=request.user)
+    
+    if wants_stream(request.GET):
+        return streaming_json_response(iter_json_object([
+            ('sent', sent_applications, SkillApplicationSerializer),
+            ('received', received_applications, SkillApplicationSerializer),
+        ]))
     
     return Response({
         'sent': SkillApplicationSerializer(sent_applications, many=True).data,
@@ -224,27 +562,146 @@ def my_applications_api(request):
     }, status=status.HTTP_200_OK)
 
 
+def application_page(applications, params, prefix='', serializer_class=SkillApplicationSerializer):
+    """
+    One keyset page of applications, read from <prefix>cursor /
+    <prefix>status and page_size. Raises InvalidCursor, or ValueError for
+    an unknown status.
+    """
+    status_filter = params.get(f'{prefix}status')
+    if status_filter:
+        if status_filter not in dict(SkillApplication.STATUS_CHOICES):
+            raise ValueError(f'Invalid {prefix}status')
+        applications = applications.filter(status=status_filter)
+    page, next_cursor, page_size = paginate_keyset(
+        serializer_class.setup_eager_loading(applications),
+        {'cursor': params.get(f'{prefix}cursor'), 'page_size': params.get('page_size')},
+    )
+    return {
+        'results': serializer_class(page, many=True).data,
+        'next_cursor': next_cursor,
+        'page_size': page_size,
+    }
+
+
+def application_inbox(request, applications):
+    """Keyset page response for one inbox, ?compact=1 drops the nested skill"""
+    compact = request.GET.get('compact', '').lower() in ('1', 'true')
+    serializer_class = CompactSkillApplicationSerializer if compact else SkillApplicationSerializer
+    try:
+        data = application_page(applications, request.GET, serializer_class=serializer_class)
+    except InvalidCursor:
+        return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(data, status=status.HTTP_200_OK)
+
+
+@query_budget(2)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def sent_applications_api(request):
+    """API endpoint for the applications the current user sent, newest first"""
+    return application_inbox(request, SkillApplication.objects.filter(applicant=request.user))
+
+
+@query_budget(2)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def received_applications_api(request):
+    """API endpoint for the applications to the current user's skills, newest first"""
+    return application_inbox(request, SkillApplication.objects.filter(owner=request.user))
+
+
+# User and profile (one join, usually cached), skills (cached per user
+# version), status counts, sent page, received page
+@query_budget(5)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def dashboard_api(request):
+    """API endpoint for everything the dashboard shows, in one round trip"""
+    user = request.user
+    try:
+        sent = application_page(SkillApplication.objects.filter(applicant=user), request.GET, 'sent_')
+        received = application_page(SkillApplication.objects.filter(owner=user), request.GET, 'received_')
+    except InvalidCursor:
+        return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    profile = user_profile(user)
+    return Response({
+        'profile': UserProfileSerializer(profile).data if profile else None,
+        'skills': my_skills_entry(user)['data'],
+        'counts': status_counts(user),
+        'sent': sent,
+        'received': received
+    }, status=status.HTTP_200_OK)
+
+
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
 def update_application_status_api(request, application_id):
     """API endpoint for updating application status"""
+    # Owners accept or reject, applicants cancel; all only while pending
+    new_status = request.data.get('status')
+    expected_version = request.data.get('version')
     try:
-        application = SkillApplication.objects.get(id=application_id, skill__user=request.user)
-        new_status = request.data.get('status')
-        
-        if new_status in ['accepted', 'rejected']:
-            application.status = new_status
-            application.save()
-            
-            return Response({
-                'message': f'Application {new_status} successfully',
-                'application': SkillApplicationSerializer(application).data
-            }, status=status.HTTP_200_OK)
-        else:
-            return Response({'error': 'Invalid status'}, status=status.HTTP_400_BAD_REQUEST)
-            
+        if expected_version is not None:
+            expected_version = int(expected_version)
+    except (TypeError, ValueError):
+        return Response({'error': 'version must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        application = transition_application(application_id, new_status, request.user, expected_version)
     except SkillApplication.DoesNotExist:
         return Response({'error': 'Application not found'}, status=status.HTTP_404_NOT_FOUND)
+    except InvalidTransition as e:
+        if e.application is None:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'error': str(e)}, status=status.HTTP_403_FORBIDDEN)
+    except StaleTransition as e:
+        return Response({
+            'error': str(e),
+            'application': SkillApplicationSerializer(e.application).data
+        }, status=status.HTTP_409_CONFLICT)
+    
+    return Response({
+        'message': f'Application {new_status} successfully',
+        'application': SkillApplicationSerializer(application).data
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_update_application_status_api(request):
+    """API endpoint for accepting/rejecting many received applications at once"""
+    # Body: {"updates": [{"id": 1, "status": "accepted"}, ...], "message": "optional note"}
+    items = request.data.get('updates')
+    if not isinstance(items, list) or not items:
+        return Response({'error': 'updates must be a non-empty list of {id, status}'}, status=status.HTTP_400_BAD_REQUEST)
+    max_updates = getattr(settings, 'APPLICATIONS_BULK_MAX', 500)
+    if len(items) > max_updates:
+        return Response({'error': f'At most {max_updates} updates per request'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    updates = {}
+    for item in items:
+        try:
+            application_id, new_status = int(item['id']), item['status']
+        except (KeyError, TypeError, ValueError):
+            return Response({'error': 'Each update needs an integer id and a status'}, status=status.HTTP_400_BAD_REQUEST)
+        if 'owner' not in allowed_roles(new_status):
+            return Response({'error': f'Invalid status for application {application_id}'}, status=status.HTTP_400_BAD_REQUEST)
+        if application_id in updates:
+            return Response({'error': f'Application {application_id} is listed twice'}, status=status.HTTP_400_BAD_REQUEST)
+        updates[application_id] = new_status
+    
+    updated, conflicts, missing = bulk_transition(request.user, updates, request.data.get('message', ''))
+    return Response({
+        'updated': SkillApplicationSerializer(updated, many=True).data,
+        'conflicts': conflicts,
+        'not_found': missing
+    }, status=status.HTTP_200_OK)
 
 
 # Profile Management APIs
@@ -254,6 +711,11 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = [IsAuthenticated]
     
     def get_object(self):
+        # Reads use the profile the authentication class cached with the user
+        if self.request.method in permissions.SAFE_METHODS:
+            profile = user_profile(self.request.user)
+            if profile is not None:
+                return profile
         profile, created = UserProfile.objects.get_or_create(user=self.request.user)
         return profile
 
@@ -262,23 +724,17 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
 @permission_classes([IsAuthenticated])
 def user_profile_api(request):
     """Get current user's profile"""
-    try:
-        profile = UserProfile.objects.get(user=request.user)
-        serializer = UserProfileSerializer(profile)
-        return Response(serializer.data)
-    except UserProfile.DoesNotExist:
+    profile = user_profile(request.user)
+    if profile is None:
         return Response({'error': 'Profile not found'}, status=status.HTTP_404_NOT_FOUND)
+    serializer = UserProfileSerializer(profile)
+    return Response(serializer.data)
 
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def send_notification_api(request):
-    """API endpoint for sending email notifications"""
-    import smtplib
-    from email.mime.text import MIMEText
-    from email.mime.multipart import MIMEMultipart
-    from django.conf import settings
-    
+    """API endpoint for queueing email notifications (sent by manage.py send_outbox)"""
     try:
         # Get email data from request
         to_email = request.data.get('to_email')
@@ -291,103 +747,32 @@ def send_notification_api(request):
         if not to_email:
             return Response({'error': 'Recipient email is required'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Create email content
-        if action == 'accepted':
-            subject = f"🎉 Your SkillHub Application for '{skill_title}' was Accepted!"
-            html_content = f"""
-            <html>
-            <body style="font-family: Arial, sans-serif; color: #333;">
-                <div style="max-width: 600px; margin: 0 auto; padding: 20px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 10px;">
-                    <h1 style="color: white; text-align: center;">🎉 Congratulations!</h1>
-                    <div style="background: white; padding: 30px; border-radius: 10px; margin: 20px 0;">
-                        <h2 style="color: #4a5568;">Great News, {to_name}!</h2>
-                        <p style="font-size: 16px; line-height: 1.6;">
-                            Your application for <strong>"{skill_title}"</strong> has been <span style="color: #48bb78; font-weight: bold;">ACCEPTED</span>!
-                        </p>
-                        <p style="font-size: 16px; line-height: 1.6;">
-                            The mentor <strong>{from_name}</strong> will contact you soon to start your learning journey.
-                        </p>
-                        <div style="background: #f7fafc; padding: 20px; border-radius: 8px; margin: 20px 0;">
-                            <p style="margin: 0; font-style: italic;">{message_content}</p>
-                        </div>
-                        <p style="color: #718096; font-size: 14px;">
-                            Thank you for using SkillHub - where knowledge meets opportunity!
-                        </p>
-                    </div>
-                </div>
-            </body>
-            </html>
-            """
-        elif action == 'rejected':
-            subject = f"SkillHub Application Update for '{skill_title}'"
-            html_content = f"""
-            <html>
-            <body style="font-family: Arial, sans-serif; color: #333;">
-                <div style="max-width: 600px; margin: 0 auto; padding: 20px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 10px;">
-                    <h1 style="color: white; text-align: center;">SkillHub</h1>
-                    <div style="background: white; padding: 30px; border-radius: 10px; margin: 20px 0;">
-                        <h2 style="color: #4a5568;">Hello {to_name},</h2>
-                        <p style="font-size: 16px; line-height: 1.6;">
-                            Thank you for your interest in <strong>"{skill_title}"</strong>.
-                        </p>
-                        <p style="font-size: 16px; line-height: 1.6;">
-                            Unfortunately, your application was not selected this time. However, don't let this discourage you!
-                        </p>
-                        <div style="background: #f7fafc; padding: 20px; border-radius: 8px; margin: 20px 0;">
-                            <p style="margin: 0; font-style: italic;">{message_content}</p>
-                        </div>
-                        <p style="font-size: 16px; line-height: 1.6;">
-                            Keep exploring other amazing skills on SkillHub. Your perfect learning opportunity is waiting!
-                        </p>
-                        <p style="color: #718096; font-size: 14px;">
-                            Best regards,<br>The SkillHub Team
-                        </p>
-                    </div>
-                </div>
-            </body>
-            </html>
-            """
-        else:  # custom message
-            subject = f"Message from {from_name} on SkillHub"
-            html_content = f"""
-            <html>
-            <body style="font-family: Arial, sans-serif; color: #333;">
-                <div style="max-width: 600px; margin: 0 auto; padding: 20px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 10px;">
-                    <h1 style="color: white; text-align: center;">📩 New Message</h1>
-                    <div style="background: white; padding: 30px; border-radius: 10px; margin: 20px 0;">
-                        <h2 style="color: #4a5568;">Hello {to_name},</h2>
-                        <p style="font-size: 16px; line-height: 1.6;">
-                            You have received a new message from <strong>{from_name}</strong> on SkillHub:
-                        </p>
-                        <div style="background: #f7fafc; padding: 20px; border-radius: 8px; margin: 20px 0; border-left: 4px solid #4299e1;">
-                            <p style="margin: 0; font-size: 16px; line-height: 1.6;">{message_content}</p>
-                        </div>
-                        <p style="color: #718096; font-size: 14px;">
-                            Visit SkillHub to continue the conversation!
-                        </p>
-                    </div>
-                </div>
-            </body>
-            </html>
-            """
+        # Digest mode: hold the event so send_outbox can coalesce it with the
+        # recipient's other notifications into one email
+        if digest_window():
+            record_notification(to_email, to_name, from_name, skill_title, action, message_content)
+            return Response({
+                'message': 'Email notification queued for digest',
+                'to': to_email
+            }, status=status.HTTP_202_ACCEPTED)
+        
+        subject, html_content = build_notification(
+            action, to_name, from_name, skill_title, message_content
+        )
         
-        # For development, we'll just log the email instead of actually sending it
-        # In production, you would configure SMTP settings
-        print(f"EMAIL NOTIFICATION:")
-        print(f"To: {to_email}")
-        print(f"Subject: {subject}")
-        print(f"Content: {html_content}")
+        # Delivery happens off the request thread so SMTP latency never blocks a worker
+        email = enqueue_email(to_email, subject, html_content)
         
-        # Simulate email sending success
         return Response({
-            'message': 'Email notification sent successfully',
+            'message': 'Email notification queued',
+            'id': email.id,
             'to': to_email,
             'subject': subject
-        }, status=status.HTTP_200_OK)
+        }, status=status.HTTP_202_ACCEPTED)
         
     except Exception as e:
-        print(f"Error sending email: {str(e)}")
+        print(f"Error queueing email: {str(e)}")
         return Response({
             'error': 'Failed to send email notification',
             'details': str(e)
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,267 @@
+"""
+SkillApplication status transitions.
+
+Each move is one conditional UPDATE that only matches while the row is
+still in an allowed source state (and, if the client sent one, still at the
+version it last saw), and it writes only status, version and updated_at.
+Two people acting on the same application at once can't both win: the
+loser's UPDATE matches no row and is reported as a conflict.
+
+Skill.application_count / pending_count are moved with F() expressions in
+the same transaction as the application write, so they stay exact without
+counting rows on read.
+"""
+from django.db import transaction
+from django.db.models import Case, Count, F, PositiveIntegerField, Q, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .caching import bump_counters_version, bump_user_skills_version
+from .models import Skill, SkillApplication
+from .notifications import queue_notifications
+
+# status -> {target status: who may make the move}
+TRANSITIONS = {
+    'pending': {
+        'accepted': 'owner',
+        'rejected': 'owner',
+        'cancelled': 'applicant',
+    },
+}
+
+
+class TransitionError(Exception):
+    def __init__(self, message, application=None):
+        super().__init__(message)
+        self.application = application
+
+
+class InvalidTransition(TransitionError):
+    """The target status doesn't exist or this user may not move to it"""
+
+
+class StaleTransition(TransitionError):
+    """The application changed since the client looked at it"""
+
+
+def allowed_sources(new_status, role):
+    return [
+        source for source, targets in TRANSITIONS.items()
+        if targets.get(new_status) == role
+    ]
+
+
+def allowed_roles(new_status):
+    return {targets[new_status] for targets in TRANSITIONS.values() if new_status in targets}
+
+
+def actor_filter(role, user):
+    return Q(owner=user) if role == 'owner' else Q(applicant=user)
+
+
+def bump_counter_versions(owner_ids):
+    """
+    The counts are part of every serialized skill, so cached browse pages and
+    the owners' my-skills/detail entries (and their ETags) must go. Deferred
+    to COMMIT: a read between the bump and the commit would otherwise cache
+    the old counters under the new version.
+    """
+    def bump():
+        bump_counters_version()
+        for owner_id in owner_ids:
+            bump_user_skills_version(owner_id)
+    transaction.on_commit(bump)
+
+
+def count_new_application(skill):
+    """Bump a skill's counters for an application just inserted as pending"""
+    Skill.objects.filter(id=skill.id).update(
+        application_count=F('application_count') + 1,
+        pending_count=F('pending_count') + 1,
+    )
+    bump_counter_versions([skill.user_id] if skill.user_id else [])
+
+
+def count_left_pending(applications):
+    """Decrement pending_count for applications that just left pending, one UPDATE"""
+    per_skill = {}
+    owners = set()
+    for application in applications:
+        per_skill[application.skill_id] = per_skill.get(application.skill_id, 0) + 1
+        if application.skill.user_id:
+            owners.add(application.skill.user_id)
+    if not per_skill:
+        return
+    Skill.objects.filter(id__in=per_skill).update(pending_count=Case(
+        # Clamped so rows written outside these helpers (admin, shell) can't
+        # push a drifted counter below zero; reconcile_counts repairs them
+        *[
+            When(id=skill_id, then=Greatest(F('pending_count') - count, Value(0)))
+            for skill_id, count in per_skill.items()
+        ],
+        default=F('pending_count'),
+        output_field=PositiveIntegerField(),
+    ))
+    bump_counter_versions(owners)
+
+
+def status_counts(user):
+    """
+    {'sent': {status: n, ..., 'total': n}, 'received': {...}} for user's
+    applications, as one conditional aggregate
+    """
+    statuses = [value for value, _ in SkillApplication.STATUS_CHOICES]
+    directions = {'sent': Q(applicant=user), 'received': Q(owner=user)}
+    totals = SkillApplication.objects.filter(Q(applicant=user) | Q(owner=user)).aggregate(**{
+        f'{direction}_{status}': Count('id', filter=condition & Q(status=status))
+        for direction, condition in directions.items()
+        for status in statuses
+    })
+    counts = {}
+    for direction in directions:
+        counts[direction] = {status: totals[f'{direction}_{status}'] for status in statuses}
+        counts[direction]['total'] = sum(counts[direction].values())
+    return counts
+
+
+def transition_queryset(new_status, user):
+    """Applications user may move to new_status right now, raises InvalidTransition"""
+    roles = allowed_roles(new_status)
+    if not roles:
+        raise InvalidTransition('Invalid status')
+    condition = Q()
+    for role in roles:
+        condition |= actor_filter(role, user) & Q(status__in=allowed_sources(new_status, role))
+    return SkillApplication.objects.filter(condition)
+
+
+def transition_application(application_id, new_status, user, expected_version=None):
+    """
+    Move one application to new_status on behalf of user and return it
+    reloaded. Raises SkillApplication.DoesNotExist when user can't see it,
+    InvalidTransition when they may not make this move and StaleTransition
+    when its status or version no longer match.
+    """
+    matching = transition_queryset(new_status, user).filter(id=application_id)
+    if expected_version is not None:
+        matching = matching.filter(version=expected_version)
+    with transaction.atomic():
+        updated = matching.update(status=new_status, version=F('version') + 1, updated_at=timezone.now())
+        application = SkillApplication.objects.select_related('applicant', 'skill__user').get(
+            Q(owner=user) | Q(applicant=user), id=application_id
+        )
+        if updated:
+            # Every transition so far starts from pending
+            count_left_pending([application])
+            return application
+
+    # Nothing matched, work out why from the row as it is now
+    role = 'owner' if application.owner_id == user.id else 'applicant'
+    if role not in allowed_roles(new_status):
+        raise InvalidTransition(f'The skill {role} cannot set status {new_status}', application)
+    if application.status not in allowed_sources(new_status, role):
+        raise StaleTransition(f'Application is already {application.status}', application)
+    raise StaleTransition(f'Application was changed since version {expected_version}', application)
+
+
+def bulk_transition(user, updates, message=''):
+    """
+    Apply owner transitions {application_id: new_status} in one transaction:
+    one SELECT checks ownership and current state, one conditional UPDATE per
+    target status moves the rows and the applicants' notifications are queued
+    in one batch. Returns (updated applications, conflicts, missing ids).
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        applications = SkillApplication.objects.select_related('applicant', 'skill__user').filter(
+            id__in=updates, owner=user
+        ).select_for_update(of=('self',))
+        found = {application.id: application for application in applications}
+        missing = [application_id for application_id in updates if application_id not in found]
+
+        conflicts, ready = [], {}
+        for application_id, new_status in updates.items():
+            application = found.get(application_id)
+            if application is None:
+                continue
+            if application.status not in allowed_sources(new_status, 'owner'):
+                conflicts.append({
+                    'id': application_id,
+                    'status': application.status,
+                    'error': f'Application is already {application.status}',
+                })
+            else:
+                ready.setdefault(new_status, []).append(application)
+
+        updated = []
+        for new_status, group in ready.items():
+            versions = {application.id: application.version for application in group}
+            moved = SkillApplication.objects.filter(
+                id__in=versions, status__in=allowed_sources(new_status, 'owner')
+            ).update(status=new_status, version=F('version') + 1, updated_at=now)
+            if moved != len(group):
+                # Someone else moved a row between the SELECT and the UPDATE
+                # (no row locks on SQLite), keep only the ones this UPDATE bumped
+                current = dict(SkillApplication.objects.filter(id__in=versions).values_list('id', 'version'))
+                group = [application for application in group if current.get(application.id) == versions[application.id] + 1]
+                conflicts += [
+                    {'id': application_id, 'error': 'Application was changed concurrently'}
+                    for application_id in versions.keys() - {application.id for application in group}
+                ]
+            for application in group:
+                application.status = new_status
+                application.version += 1
+                application.updated_at = now
+            updated += group
+
+        count_left_pending(updated)
+        queue_notifications([
+            {
+                'to_email': application.applicant.email,
+                'to_name': application.applicant.first_name or application.applicant.username,
+                'from_name': user.first_name or user.username,
+                'skill_title': application.skill.title,
+                'action': application.status,
+                'message': message,
+            }
+            for application in updated
+            if application.applicant.email
+        ])
+    return updated, conflicts, missing
+
+
+def reconcile_counts(batch_size=500, skill_model=Skill, application_model=SkillApplication):
+    """
+    Recompute application_count/pending_count from SkillApplication a batch of
+    skills at a time and write back only the rows that drifted, dropping the
+    cached responses that showed them. Returns the number of skills fixed.
+    """
+    fixed = 0
+    last_id = 0
+    while True:
+        skills = list(
+            skill_model.objects.filter(id__gt=last_id).order_by('id')
+            .only('id', 'user_id', 'application_count', 'pending_count')[:batch_size]
+        )
+        if not skills:
+            if fixed:
+                bump_counters_version()
+            return fixed
+        last_id = skills[-1].id
+        counts = {
+            row['skill_id']: row
+            for row in application_model.objects.filter(skill_id__in=[skill.id for skill in skills])
+            .values('skill_id')
+            .annotate(total=Count('id'), pending=Count('id', filter=Q(status='pending')))
+        }
+        drifted = []
+        for skill in skills:
+            row = counts.get(skill.id, {'total': 0, 'pending': 0})
+            if (skill.application_count, skill.pending_count) != (row['total'], row['pending']):
+                skill.application_count, skill.pending_count = row['total'], row['pending']
+                drifted.append(skill)
+        with transaction.atomic():
+            skill_model.objects.bulk_update(drifted, ['application_count', 'pending_count'])
+        for owner_id in {skill.user_id for skill in drifted if skill.user_id}:
+            bump_user_skills_version(owner_id)
+        fixed += len(drifted)
@@ -0,0 +1,64 @@
+"""
+JWT authentication without a user query on every request.
+
+JWTAuthentication looks the token's user up in the database on each call.
+CachedJWTAuthentication keeps that user, with its UserProfile already
+attached, under a key that embeds a per-user version. core.signals bumps the
+version whenever the user or their profile is saved or deleted, so a
+deactivation or profile edit takes effect on the next request.
+
+Like the browse cache this uses the default cache: per process with the
+local-memory backend, shared across workers with CACHE_URL. Writes that
+skip signals (QuerySet.update) are picked up once AUTH_USER_CACHE_TIMEOUT
+runs out.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .caching import get_auth_version
+
+
+def user_cache_timeout():
+    return getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 60)
+
+
+def cached_user(user_model, user_id):
+    """
+    The token's user with their profile joined in (a missing profile is
+    cached as well), from the cache when this version of them is there
+    """
+    cache_key = f'auth:user:{user_id}:{get_auth_version(user_id)}'
+    user = cache.get(cache_key)
+    if user is None:
+        user = user_model.objects.select_related('userprofile').get(**{api_settings.USER_ID_FIELD: user_id})
+        cache.set(cache_key, user, user_cache_timeout())
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that resolves the user through cached_user"""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_('Token contained no recognizable user identification')) from e
+
+        try:
+            user = cached_user(self.user_model, user_id)
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found') from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+
+        return user
@@ -0,0 +1,35 @@
+import functools
+import logging
+
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+logger = logging.getLogger(__name__)
+
+
+def query_budget(max_queries, methods=('GET',)):
+    """
+    Declare how many queries a view may run for the given methods, including
+    the JWT user lookup. The budget is stored on the view for
+    core.tests.test_query_budgets, and in DEBUG every request over budget logs
+    a warning.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if not settings.DEBUG or request.method not in methods:
+                return view(request, *args, **kwargs)
+            with CaptureQueriesContext(connection) as queries:
+                response = view(request, *args, **kwargs)
+            if len(queries) > max_queries:
+                logger.warning(
+                    '%s %s ran %d queries, budget is %d',
+                    request.method, request.path, len(queries), max_queries,
+                )
+            return response
+
+        wrapped.query_budget = max_queries
+        wrapped.query_budget_methods = methods
+        return wrapped
+    return decorator
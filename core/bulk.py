@@ -0,0 +1,121 @@
+"""
+NDJSON bulk import and export of skills.
+
+Import validates each line with SkillSerializer, then inserts a chunk at a
+time with bulk_create inside its own transaction. bulk_create skips model
+signals, so the work core.signals would do per save (geocoding, tags, cache
+versions) is done here in bulk; the FTS index is kept by database triggers.
+Export streams rows off a server-side iterator so memory stays flat.
+"""
+import json
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.encoders import JSONEncoder
+
+from .caching import bump_catalogue_version, bump_user_skills_version
+from .geo import apply_geocode
+from .matching import get_tag_ids, skill_tag_rows, skill_tokens
+from .models import Skill, SkillTag
+from .serializers import SkillSerializer
+from .streaming import iter_representations
+
+# Per-line errors beyond this are only counted, not echoed back
+MAX_REPORTED_ERRORS = 1000
+
+
+def bulk_chunk_size():
+    return getattr(settings, 'SKILLS_BULK_CHUNK_SIZE', 500)
+
+
+def index_skills_bulk(skills):
+    """Create SkillTag rows for freshly bulk-created skills"""
+    skills = [skill for skill in skills if skill.is_active]
+    names = set()
+    for skill in skills:
+        offered, wanted = skill_tokens(skill)
+        names |= offered | wanted
+    tag_ids = get_tag_ids(names)
+    rows = []
+    for skill in skills:
+        rows += skill_tag_rows(skill, tag_ids)
+    SkillTag.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, line_number, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line_number, 'errors': errors})
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors),
+        }
+
+
+def _insert_chunk(skills, result):
+    with transaction.atomic():
+        created = Skill.objects.bulk_create(skills)
+        index_skills_bulk(created)
+    result.created += len(created)
+
+
+def import_ndjson(lines, user, chunk_size=None):
+    """
+    Import skills owned by user from an iterable of NDJSON lines (str or
+    bytes). Invalid lines are reported and skipped; valid ones are inserted
+    in chunks, so a bad line never rolls back good ones.
+    """
+    chunk_size = chunk_size or bulk_chunk_size()
+    # One serializer instance validates every line, fields are built once
+    serializer = SkillSerializer()
+    result = ImportResult()
+    chunk = []
+
+    for line_number, line in enumerate(lines, start=1):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8', errors='replace')
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+            if not isinstance(item, dict):
+                raise ValueError('Each line must be a JSON object')
+            validated = serializer.run_validation(item)
+        except ValueError as e:
+            result.add_error(line_number, [str(e)])
+            continue
+        except ValidationError as e:
+            result.add_error(line_number, e.detail)
+            continue
+
+        skill = Skill(user=user, **validated)
+        apply_geocode(skill)
+        chunk.append(skill)
+        if len(chunk) >= chunk_size:
+            _insert_chunk(chunk, result)
+            chunk = []
+
+    if chunk:
+        _insert_chunk(chunk, result)
+    if result.created:
+        bump_catalogue_version()
+        bump_user_skills_version(user.id)
+    return result
+
+
+def export_ndjson(skills, chunk_size=None):
+    """Yield one NDJSON line per skill, reading through a server-side iterator"""
+    encoder = JSONEncoder(ensure_ascii=False)
+    for data in iter_representations(skills, SkillSerializer, chunk_size or bulk_chunk_size()):
+        yield encoder.encode(data) + '\n'
@@ -0,0 +1,166 @@
+"""
+Versioned response caching for skill browsing.
+
+Every cache entry embeds the catalogue version in its key. Skill writes bump
+the version (see core.signals), which orphans all old entries at once instead
+of hunting them down. Application counters move far more often than skills
+do, so they have a version of their own that only the browse pages (which
+show the counters) embed; facets and the in-process indexes keep theirs. The ETag is derived from the same version and filter
+set, so a conditional request can be answered without touching the database.
+
+Cross-worker invalidation needs a shared cache (CACHE_URL=rediscache://...);
+with the default local-memory cache each worker only sees its own bumps and
+other workers serve stale pages for at most SKILLS_CACHE_TIMEOUT seconds.
+"""
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+CATALOGUE_VERSION_KEY = 'skills:catalogue-version'
+COUNTERS_VERSION_KEY = 'skills:counters-version'
+
+# Normalized the same way the filters treat them: icontains/full-text/tag
+# filters and geocoded place names are case-insensitive, proficiency is an
+# exact choice value
+CASE_INSENSITIVE_PARAMS = ('category', 'location', 'search', 'wants', 'offers', 'near')
+EXACT_PARAMS = ('proficiency', 'availability', 'cursor', 'page_size', 'include_total', 'radius', 'k')
+
+
+def _fresh_version():
+    # Seeded from the clock so an evicted version never restarts at a number
+    # that older entries were stored under
+    return int(time.time() * 1000)
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _fresh_version(), None)
+        version = cache.get(key, _fresh_version())
+    return version
+
+
+def _bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _fresh_version(), None)
+
+
+def get_catalogue_version():
+    return _get_version(CATALOGUE_VERSION_KEY)
+
+
+def bump_catalogue_version():
+    _bump_version(CATALOGUE_VERSION_KEY)
+
+
+def get_counters_version():
+    return _get_version(COUNTERS_VERSION_KEY)
+
+
+def bump_counters_version():
+    """Skill.application_count / pending_count changed, see core.applications"""
+    _bump_version(COUNTERS_VERSION_KEY)
+
+
+def normalize_filters(params):
+    """Reduce a query dict to the parameters that affect the browse response"""
+    normalized = {}
+    for name in CASE_INSENSITIVE_PARAMS:
+        value = params.get(name, '').strip().lower()
+        if value:
+            normalized[name] = value
+    for name in EXACT_PARAMS:
+        if name in params:
+            normalized[name] = params.get(name).strip()
+    return normalized
+
+
+def browse_cache_key(filters, kind='browse', counters=True):
+    """
+    Return (cache key, strong ETag) for normalized /skills/ filters. Pass
+    counters=False for responses that don't show the application counters.
+    """
+    filters = json.dumps(filters, sort_keys=True, separators=(',', ':'))
+    version = get_catalogue_version()
+    if counters:
+        version = f'{version}.{get_counters_version()}'
+    digest = hashlib.sha1(f'{kind}:{version}:{filters}'.encode()).hexdigest()
+    return f'skills:{kind}:{digest}', f'"{digest}"'
+
+
+def user_skills_version_key(user_id):
+    return f'skills:user-version:{user_id}'
+
+
+def get_user_skills_version(user_id):
+    return _get_version(user_skills_version_key(user_id))
+
+
+def bump_user_skills_version(user_id):
+    _bump_version(user_skills_version_key(user_id))
+
+
+def auth_version_key(user_id):
+    return f'auth:user-version:{user_id}'
+
+
+def get_auth_version(user_id):
+    """Version of the cached authenticated user, see core.authentication"""
+    return _get_version(auth_version_key(user_id))
+
+
+def bump_auth_version(user_id):
+    _bump_version(auth_version_key(user_id))
+
+
+def user_cache_key(kind, user_id, *parts):
+    """Key for a per-user entry that a bump of the user's version orphans"""
+    version = get_user_skills_version(user_id)
+    return ':'.join(str(part) for part in ('skills', kind, user_id, version) + parts)
+
+
+def make_etag(*parts):
+    return '"%s"' % hashlib.sha1(':'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def validator_headers(etag, last_modified=None, cache_control='private, no-cache'):
+    headers = {'ETag': etag, 'Cache-Control': cache_control}
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified)
+    return headers
+
+
+def not_modified(request, etag, last_modified=None, cache_control='private, no-cache'):
+    """
+    A 304 Response when If-None-Match / If-Modified-Since still match the
+    given validators, otherwise None. last_modified is a Unix timestamp.
+    """
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None and response.status_code == 304:
+        return Response(status=304, headers=validator_headers(etag, last_modified, cache_control))
+    return None
+
+
+def versioned_entry(data, etag, last_modified=None):
+    """What the per-user caches store: the body plus its validators"""
+    return {'data': data, 'etag': etag, 'last_modified': last_modified}
+
+
+def entry_response(request, entry):
+    """Serve a versioned_entry, as a 304 when the client already has it"""
+    response = not_modified(request, entry['etag'], entry['last_modified'])
+    if response is not None:
+        return response
+    return Response(entry['data'], headers=validator_headers(entry['etag'], entry['last_modified']))
+
+
+def browse_cache_timeout():
+    return getattr(settings, 'SKILLS_CACHE_TIMEOUT', 300)
@@ -0,0 +1,189 @@
+"""
+Offline geocoding and nearest-skill search without PostGIS.
+
+Free-text locations are resolved against the bundled city table in
+core/data/cities.csv. Located skills also store the id of the GRID_DEGREES
+square they fall in, so a radius query becomes an indexed IN over the few
+cells its bounding box touches; those candidates are then ranked by exact
+haversine distance.
+"""
+import csv
+import functools
+import heapq
+import math
+import re
+from pathlib import Path
+
+from django.conf import settings
+
+CITY_TABLE = Path(__file__).resolve().parent / 'data' / 'cities.csv'
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = EARTH_RADIUS_KM * math.pi / 180
+
+# Stored in Skill.geo_cell, changing it means re-running the backfill
+GRID_DEGREES = 1
+GRID_COLUMNS = 360 // GRID_DEGREES
+
+# Past this many cells the IN list costs more than it saves, fall back to
+# the latitude band alone
+MAX_CELLS = 400
+
+# Other names people type for cities in the table
+ALIASES = {
+    'bangalore': 'bengaluru',
+    'bombay': 'mumbai',
+    'madras': 'chennai',
+    'calcutta': 'kolkata',
+    'gurgaon': 'gurugram',
+    'mysore': 'mysuru',
+    'mangalore': 'mangaluru',
+    'trivandrum': 'thiruvananthapuram',
+    'nyc': 'new york',
+    'new york city': 'new york',
+    'sf': 'san francisco',
+    'washington dc': 'washington',
+    'saigon': 'ho chi minh city',
+}
+
+_SEPARATOR_RE = re.compile(r'[^\w]+', re.UNICODE)
+_COORDINATES_RE = re.compile(r'^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$')
+
+
+class InvalidGeoQuery(ValueError):
+    pass
+
+
+@functools.lru_cache(maxsize=None)
+def city_table():
+    """{'name': (lat, lng), 'name country': (lat, lng)} from the bundled CSV"""
+    cities = {}
+    with open(CITY_TABLE, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            coordinates = (float(row['latitude']), float(row['longitude']))
+            name = _normalize(row['name'])
+            cities.setdefault(name, coordinates)
+            cities[f"{name} {row['country'].lower()}"] = coordinates
+    return cities
+
+
+def _normalize(text):
+    return _SEPARATOR_RE.sub(' ', text.lower()).strip()
+
+
+def geocode(text):
+    """(latitude, longitude) of the city named in a free-text location, or None"""
+    if not text:
+        return None
+    cities = city_table()
+    # The whole string first ('Paris, FR'), then each part ('Koramangala, Bangalore')
+    for candidate in [text] + text.split(','):
+        name = _normalize(candidate)
+        name = ALIASES.get(name, name)
+        if name in cities:
+            return cities[name]
+    return None
+
+
+def grid_cell(latitude, longitude):
+    row = min(int((latitude + 90) // GRID_DEGREES), 180 // GRID_DEGREES - 1)
+    column = int(((longitude + 180) % 360) // GRID_DEGREES)
+    return row * GRID_COLUMNS + column
+
+
+def apply_geocode(instance):
+    """Set latitude/longitude (and geo_cell where the model has one) from location"""
+    coordinates = geocode(instance.location)
+    instance.latitude, instance.longitude = coordinates or (None, None)
+    if hasattr(instance, 'geo_cell'):
+        instance.geo_cell = grid_cell(*coordinates) if coordinates else None
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_cells(latitude, longitude, radius_km):
+    """
+    Grid cells covering the circle's bounding box, or None when there are
+    too many (huge radius or near a pole) to be worth listing
+    """
+    lat_delta = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = max(-90.0, latitude - lat_delta), min(90.0, latitude + lat_delta)
+    # Longitude degrees shrink towards the poles, widen by the worst latitude
+    widest = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if widest <= 0 or lat_delta / widest >= 180:
+        return None
+    lng_delta = lat_delta / widest
+
+    first_row, last_row = grid_cell(min_lat, 0) // GRID_COLUMNS, grid_cell(max_lat, 0) // GRID_COLUMNS
+    first_column = int((longitude - lng_delta + 180) // GRID_DEGREES)
+    last_column = int((longitude + lng_delta + 180) // GRID_DEGREES)
+    columns = {column % GRID_COLUMNS for column in range(first_column, last_column + 1)}
+    if (last_row - first_row + 1) * len(columns) > MAX_CELLS:
+        return None
+    return [
+        row * GRID_COLUMNS + column
+        for row in range(first_row, last_row + 1)
+        for column in sorted(columns)
+    ]
+
+
+def parse_origin(value):
+    """'lat,lng' or a city name from the table -> (lat, lng)"""
+    match = _COORDINATES_RE.match(value)
+    if match:
+        latitude, longitude = float(match.group(1)), float(match.group(2))
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise InvalidGeoQuery('Coordinates out of range')
+        return latitude, longitude
+    coordinates = geocode(value)
+    if coordinates is None:
+        raise InvalidGeoQuery(f"Unknown location '{value}'")
+    return coordinates
+
+
+def parse_near_params(params):
+    """(latitude, longitude, radius_km, k) from near/radius/k query parameters"""
+    latitude, longitude = parse_origin(params['near'])
+    max_radius = getattr(settings, 'SKILLS_GEO_MAX_RADIUS_KM', 500)
+    max_k = getattr(settings, 'SKILLS_MAX_PAGE_SIZE', 100)
+    try:
+        radius = float(params.get('radius') or getattr(settings, 'SKILLS_GEO_DEFAULT_RADIUS_KM', 50))
+        k = int(params.get('k') or getattr(settings, 'SKILLS_PAGE_SIZE', 20))
+    except ValueError:
+        raise InvalidGeoQuery('radius and k must be numbers')
+    if not 0 < radius <= max_radius:
+        raise InvalidGeoQuery(f'radius must be between 0 and {max_radius} km')
+    return latitude, longitude, radius, max(1, min(k, max_k))
+
+
+def nearest(queryset, latitude, longitude, radius_km, k):
+    """
+    The k rows of queryset closest to the origin within radius_km, as
+    [(instance, distance_km)] nearest first
+    """
+    lat_delta = radius_km / KM_PER_DEGREE
+    # Distance decides the order, don't make the database sort candidates
+    candidates = queryset.order_by().filter(
+        geo_cell__isnull=False,
+        latitude__range=(latitude - lat_delta, latitude + lat_delta),
+    )
+    cells = bounding_cells(latitude, longitude, radius_km)
+    if cells is not None:
+        candidates = candidates.filter(geo_cell__in=cells)
+
+    distances = (
+        (haversine_km(latitude, longitude, lat, lng), pk)
+        for pk, lat, lng in candidates.values_list('pk', 'latitude', 'longitude')
+    )
+    closest = heapq.nsmallest(k, (item for item in distances if item[0] <= radius_km))
+    if not closest:
+        return []
+    rows = queryset.in_bulk([pk for _, pk in closest])
+    return [(rows[pk], distance) for distance, pk in closest if pk in rows]
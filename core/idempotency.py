@@ -0,0 +1,89 @@
+"""
+Idempotency-Key support for unsafe API endpoints.
+
+A client that may retry a POST sends the same Idempotency-Key header with
+each attempt. The first attempt claims the key with cache.add (atomic
+set-if-absent); once it finishes, the response is stored under the key and
+later attempts get it replayed instead of running the view again. Keys are
+scoped per user and endpoint and expire after IDEMPOTENCY_KEY_TTL seconds.
+
+Like the browse cache, this needs a shared CACHE_URL for retries that land on
+another worker; database constraints remain the backstop against duplicates.
+"""
+import functools
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def key_ttl():
+    return getattr(settings, 'IDEMPOTENCY_KEY_TTL', 24 * 60 * 60)
+
+
+def request_fingerprint(request):
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha1(f'{request.method}:{request.path}:{body}'.encode()).hexdigest()
+
+
+def idempotent(scope):
+    """
+    Honour an Idempotency-Key header on a DRF function view. Place it directly
+    above the view function, below @api_view and @permission_classes.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapped(request, *args, **kwargs):
+            key = request.headers.get(HEADER)
+            if not key or not request.user.is_authenticated:
+                return view(request, *args, **kwargs)
+            if len(key) > MAX_KEY_LENGTH:
+                return Response(
+                    {'error': f'{HEADER} must be at most {MAX_KEY_LENGTH} characters'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            digest = hashlib.sha1(key.encode()).hexdigest()
+            cache_key = f'idempotency:{scope}:{request.user.id}:{digest}'
+            fingerprint = request_fingerprint(request)
+
+            if not cache.add(cache_key, {'state': 'pending', 'fingerprint': fingerprint}, key_ttl()):
+                entry = cache.get(cache_key)
+                if entry is not None:
+                    if entry['fingerprint'] != fingerprint:
+                        return Response(
+                            {'error': f'{HEADER} was already used with a different request'},
+                            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+                        )
+                    if entry['state'] == 'pending':
+                        return Response(
+                            {'error': f'A request with this {HEADER} is still being processed'},
+                            status=status.HTTP_409_CONFLICT
+                        )
+                    return Response(entry['data'], status=entry['status'], headers={'Idempotent-Replayed': 'true'})
+
+            try:
+                response = view(request, *args, **kwargs)
+            except Exception:
+                cache.delete(cache_key)
+                raise
+            # Server errors are not final, let the client retry them for real
+            if response.status_code >= 500:
+                cache.delete(cache_key)
+            else:
+                cache.set(cache_key, {
+                    'state': 'done',
+                    'fingerprint': fingerprint,
+                    'status': response.status_code,
+                    'data': response.data,
+                }, key_ttl())
+            return response
+
+        return wrapped
+    return decorator
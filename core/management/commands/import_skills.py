@@ -0,0 +1,40 @@
+import json
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from core.bulk import bulk_chunk_size, import_ndjson
+
+
+class Command(BaseCommand):
+    help = 'Bulk import skills from an NDJSON file (one skill object per line)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="NDJSON file to read, or '-' for stdin")
+        parser.add_argument('--user', required=True, help='Username that will own the imported skills')
+        parser.add_argument('--chunk-size', type=int, default=None, help='Rows per batch transaction')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist")
+
+        chunk_size = options['chunk_size'] or bulk_chunk_size()
+        if options['path'] == '-':
+            result = import_ndjson(sys.stdin, user, chunk_size)
+        else:
+            try:
+                with open(options['path'], encoding='utf-8') as f:
+                    result = import_ndjson(f, user, chunk_size)
+            except OSError as e:
+                raise CommandError(str(e))
+
+        for error in result.errors:
+            self.stderr.write(f"line {error['line']}: {json.dumps(error['errors'])}")
+        if result.failed > len(result.errors):
+            self.stderr.write(f'... {result.failed - len(result.errors)} more errors not shown')
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {result.created} skills for {user.username}, {result.failed} lines failed'
+        ))
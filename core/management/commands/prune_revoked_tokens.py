@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.tokens import prune_expired
+
+
+class Command(BaseCommand):
+    help = 'Delete revoked refresh tokens that have expired'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per DELETE')
+
+    def handle(self, *args, **options):
+        deleted = prune_expired(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired revoked tokens'))
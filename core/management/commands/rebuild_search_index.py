@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core import search
+
+
+class Command(BaseCommand):
+    help = 'Recreate and repopulate the full-text search index for skills'
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            self.stdout.write(self.style.WARNING(
+                f'No full-text index for {connection.vendor}, search uses icontains'
+            ))
+            return
+
+        self.stdout.write(f'Rebuilding skill search index on {connection.vendor}...')
+        search.create_index(connection, rebuild=True)
+        self.stdout.write(self.style.SUCCESS('Skill search index rebuilt'))
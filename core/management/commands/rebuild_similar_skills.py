@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from core.similarity import index_path, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Refit the TF-IDF similar-skills model over all active skills and compact it'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding similar-skills model...')
+        index = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {index.matrix.shape[0]} skills, '
+            f'{len(getattr(index.vectorizer, "vocabulary_", {}))} terms, saved to {index_path()}'
+        ))
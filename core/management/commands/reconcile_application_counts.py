@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.applications import reconcile_counts
+
+
+class Command(BaseCommand):
+    help = 'Recompute Skill.application_count and pending_count from SkillApplication rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Skills per batch')
+
+    def handle(self, *args, **options):
+        fixed = reconcile_counts(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Fixed counters on {fixed} skills'))
@@ -0,0 +1,51 @@
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from core.notifications import flush_digests
+from core.outbox import claim_batch, deliver_batch
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued notification emails in batches over one reused mail connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=getattr(settings, 'OUTBOX_BATCH_SIZE', 50))
+        parser.add_argument('--max-attempts', type=int, default=getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 5))
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of exiting when drained')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds to sleep between polls with --loop')
+
+    def handle(self, *args, **options):
+        connection = get_connection()
+        total_sent = total_failed = 0
+        try:
+            while True:
+                digests = flush_digests()
+                if digests:
+                    self.stdout.write(f'Queued {digests} digest emails')
+
+                emails = claim_batch(options['batch_size'])
+                if emails:
+                    # open() is a no-op while the previous batch's session is still up;
+                    # if the server is down each send fails and gets rescheduled
+                    try:
+                        connection.open()
+                    except Exception as e:
+                        self.stdout.write(self.style.WARNING(f'Could not connect to mail server: {e}'))
+                    sent, failed = deliver_batch(emails, connection, options['max_attempts'])
+                    total_sent += sent
+                    total_failed += failed
+                    self.stdout.write(f'Batch of {len(emails)}: {sent} sent, {failed} failed')
+                    continue
+
+                if not options['loop']:
+                    break
+                # Don't hold an idle SMTP session open while the queue is empty
+                connection.close()
+                time.sleep(options['interval'])
+        finally:
+            connection.close()
+
+        self.stdout.write(self.style.SUCCESS(f'Outbox drained: {total_sent} sent, {total_failed} failed'))
@@ -0,0 +1,171 @@
+"""
+Reciprocal swap matching.
+
+Offered skills (active Skill title + category) and wanted skills (the
+comma-separated skills_wanted) are normalized into Tags, minus STOPWORDS,
+linked through SkillTag, which doubles as the inverted index tag -> users.
+A mutual match for user A is any user B who offers a tag A wants *and*
+wants a tag A offers; both halves are single grouped lookups on the index
+instead of comparing every pair of users.
+"""
+import re
+
+from django.db.models import Count, Q
+
+from .models import SkillTag, Tag
+
+# Words that say nothing about which skill is meant. Titles are free text
+# ("Web programming from scratch using Python"), so besides function words
+# this drops teaching filler, levels and the umbrella terms that sit in
+# front of the actual skill: a tag shared by half the catalogue matches
+# everyone with everyone.
+STOPWORDS = {
+    # Function words
+    'a', 'an', 'and', 'or', 'the', 'of', 'for', 'to', 'in', 'on', 'at', 'by',
+    'with', 'without', 'from', 'into', 'about', 'as', 'via', 'using', 'use',
+    'how', 'what', 'is', 'are', 'be', 'can', 'will', 'i', 'me', 'my', 'you',
+    'your', 'we', 'our', 'it', 'its', 'this', 'that', 'all', 'any', 'some',
+    'more', 'other', 'etc', 'vs', 'plus', 'also', 'up',
+    # Levels and teaching filler
+    'basic', 'basics', 'beginner', 'beginners', 'intermediate', 'advanced',
+    'expert', 'experts', 'pro', 'professional', 'master', 'mastery', 'mastering',
+    'fundamental', 'fundamentals', 'essential', 'essentials', 'complete',
+    'practical', 'hands', 'scratch', 'zero', 'hero', 'easy', 'simple', 'quick',
+    'lesson', 'lessons', 'class', 'classes', 'course', 'courses', 'tutorial',
+    'tutorials', 'tutoring', 'tutor', 'teaching', 'teach', 'coaching', 'coach',
+    'session', 'sessions', 'workshop', 'guide', 'help', 'intro', 'introduction',
+    'learn', 'learning', 'skill', 'skills', 'online', 'private', 'one',
+    'kids', 'adults', 'everyone', 'anyone', 'people',
+    # Umbrella terms in front of the actual skill
+    'web', 'programming', 'coding', 'development', 'developer', 'software',
+    'engineering', 'technology', 'tech', 'computer', 'language', 'languages',
+    'general', 'misc', 'stuff', 'things',
+}
+
+# Collapse the common spellings of the same thing onto one token
+ALIASES = {
+    'js': 'javascript',
+    'nodejs': 'node',
+    'reactjs': 'react',
+    'vuejs': 'vue',
+    'py': 'python',
+    'ml': 'machinelearning',
+}
+
+_WORD_RE = re.compile(r'[a-z0-9+#]+')
+
+
+def normalize_tokens(text):
+    """'Node.js, React JS' -> {'node', 'react', 'javascript'}"""
+    # Drop dots inside words first so node.js / vue.js collapse to one word
+    text = re.sub(r'(?<=\w)\.(?=\w)', '', text.lower())
+    tokens = set()
+    for word in _WORD_RE.findall(text):
+        word = ALIASES.get(word, word)
+        if word in STOPWORDS:
+            continue
+        # Single letters are noise except for the languages named by one
+        if len(word) > 1 or word in ('c', 'r'):
+            tokens.add(word[:64])
+    return tokens
+
+
+def skill_tokens(skill):
+    """Return (offered, wanted) token sets for a Skill-like object"""
+    offered = normalize_tokens(f'{skill.title} {skill.category}')
+    wanted = set()
+    for entry in (skill.skills_wanted or '').split(','):
+        wanted |= normalize_tokens(entry)
+    return offered, wanted
+
+
+def get_tag_ids(names, tag_model=Tag):
+    """{name: id} for the given normalized names, creating missing tags"""
+    if not names:
+        return {}
+    tag_ids = dict(tag_model.objects.filter(name__in=names).values_list('name', 'id'))
+    missing = set(names) - tag_ids.keys()
+    if missing:
+        # ignore_conflicts: a concurrent save may create the same tag first
+        tag_model.objects.bulk_create([tag_model(name=name) for name in missing], ignore_conflicts=True)
+        tag_ids.update(tag_model.objects.filter(name__in=missing).values_list('name', 'id'))
+    return tag_ids
+
+
+def skill_tag_rows(skill, tag_ids, skill_tag_model=SkillTag):
+    offered, wanted = skill_tokens(skill)
+    return [
+        skill_tag_model(skill_id=skill.pk, user_id=skill.user_id, role=role, tag_id=tag_ids[name])
+        for role, names in (('offered', offered), ('wanted', wanted))
+        for name in names
+    ]
+
+
+def index_skill(skill):
+    """Replace a skill's SkillTag rows (none when inactive)"""
+    SkillTag.objects.filter(skill_id=skill.pk).delete()
+    if not skill.is_active or not skill.user_id:
+        return
+    offered, wanted = skill_tokens(skill)
+    tag_ids = get_tag_ids(offered | wanted)
+    SkillTag.objects.bulk_create(skill_tag_rows(skill, tag_ids))
+
+
+def _users_by_tag_count(role, tag_ids, exclude_user):
+    if not tag_ids:
+        return {}
+    rows = (
+        SkillTag.objects.filter(role=role, tag_id__in=tag_ids)
+        .exclude(user=exclude_user)
+        .values('user')
+        .annotate(matched=Count('tag', distinct=True))
+    )
+    return {row['user']: row['matched'] for row in rows}
+
+
+def find_matches(user):
+    """
+    Ranked mutual matches for user as [(user_id, they_offer, they_want)], where
+    they_offer counts tags the other user offers that user wants and
+    they_want the reverse. Ranked by the weaker side first so lopsided
+    matches sink, then by total overlap.
+    """
+    offered, wanted = set(), set()
+    for role, tag_id in SkillTag.objects.filter(user=user).values_list('role', 'tag_id'):
+        (offered if role == 'offered' else wanted).add(tag_id)
+
+    they_offer = _users_by_tag_count('offered', wanted, user)
+    they_want = _users_by_tag_count('wanted', offered, user)
+    matches = [
+        (other, they_offer[other], they_want[other])
+        for other in they_offer.keys() & they_want.keys()
+    ]
+    matches.sort(key=lambda match: (-min(match[1], match[2]), -(match[1] + match[2]), match[0]))
+    return matches, offered, wanted
+
+
+def matched_tokens(user_ids, offered, wanted):
+    """{user_id: {'they_offer': [...], 'they_want': [...]}} tag names for a page of matches"""
+    details = {user_id: {'they_offer': set(), 'they_want': set()} for user_id in user_ids}
+    rows = SkillTag.objects.filter(user__in=user_ids).filter(
+        Q(role='offered', tag_id__in=wanted) | Q(role='wanted', tag_id__in=offered)
+    ).values_list('user', 'role', 'tag__name')
+    for user_id, role, name in rows:
+        details[user_id]['they_offer' if role == 'offered' else 'they_want'].add(name)
+    return {
+        user_id: {key: sorted(names) for key, names in detail.items()}
+        for user_id, detail in details.items()
+    }
+
+
+def tag_filter(skills, role, value):
+    """
+    Skills linked to any tag normalized from a comma-separated value in the
+    given role, as an indexed semi-join on SkillTag instead of icontains
+    """
+    names = set()
+    for entry in value.split(','):
+        names |= normalize_tokens(entry)
+    return skills.filter(
+        id__in=SkillTag.objects.filter(role=role, tag__name__in=names).values('skill_id')
+    )
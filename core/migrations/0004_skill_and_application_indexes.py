@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_skill_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', '-id'], name='skill_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['user', 'is_active', '-created_at'], name='skill_user_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['category'], name='skill_active_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skillapplication',
+            index=models.Index(fields=['skill', 'applicant', 'status'], name='application_skill_appl_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skillapplication',
+            index=models.Index(fields=['applicant', '-created_at'], name='application_sent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skillapplication',
+            index=models.Index(fields=['skill', '-created_at'], name='application_received_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_outboundemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('to_email', models.EmailField(max_length=254)),
+                ('to_name', models.CharField(blank=True, default='', max_length=150)),
+                ('from_name', models.CharField(blank=True, default='', max_length=150)),
+                ('skill_title', models.CharField(blank=True, default='', max_length=200)),
+                ('action', models.CharField(choices=[('accepted', 'Accepted'), ('rejected', 'Rejected'), ('message', 'Message')], default='message', max_length=20)),
+                ('message', models.TextField(blank=True, default='')),
+                ('claim_token', models.CharField(blank=True, default='', max_length=32)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['to_email', 'created_at'], name='notification_recipient_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_pendingnotification'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['updated_at'], name='skill_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:16
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+from core.matching import skill_tokens
+
+
+def populate_skill_tokens(apps, schema_editor):
+    Skill = apps.get_model('core', 'Skill')
+    SkillToken = apps.get_model('core', 'SkillToken')
+    batch = []
+    skills = Skill.objects.filter(is_active=True, user__isnull=False).only(
+        'id', 'user_id', 'title', 'category', 'skills_wanted'
+    )
+    for skill in skills.iterator(chunk_size=500):
+        offered, wanted = skill_tokens(skill)
+        batch += [SkillToken(skill_id=skill.id, user_id=skill.user_id, role='offered', token=token) for token in offered]
+        batch += [SkillToken(skill_id=skill.id, user_id=skill.user_id, role='wanted', token=token) for token in wanted]
+        if len(batch) >= 1000:
+            SkillToken.objects.bulk_create(batch)
+            batch = []
+    SkillToken.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0007_skill_updated_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('offered', 'Offered'), ('wanted', 'Wanted')], max_length=10)),
+                ('token', models.CharField(max_length=64)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tokens', to='core.skill')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['role', 'token', 'user'], name='skilltoken_lookup_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='skilltoken',
+            constraint=models.UniqueConstraint(fields=('skill', 'role', 'token'), name='unique_skill_role_token'),
+        ),
+        migrations.RunPython(populate_skill_tokens, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,96 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+from core.matching import get_tag_ids, skill_tag_rows, skill_tokens
+
+BATCH_SIZE = 500
+
+
+def populate_skill_tags(apps, schema_editor):
+    """Parse every active skill's title/category/skills_wanted into tags, a batch at a time"""
+    Skill = apps.get_model('core', 'Skill')
+    Tag = apps.get_model('core', 'Tag')
+    SkillTag = apps.get_model('core', 'SkillTag')
+    skills = Skill.objects.filter(is_active=True, user__isnull=False).only(
+        'id', 'user_id', 'title', 'category', 'skills_wanted'
+    ).order_by('id')
+
+    batch = []
+    for skill in skills.iterator(chunk_size=BATCH_SIZE):
+        batch.append(skill)
+        if len(batch) == BATCH_SIZE:
+            tag_batch(batch, Tag, SkillTag)
+            batch = []
+    tag_batch(batch, Tag, SkillTag)
+
+
+def tag_batch(skills, Tag, SkillTag):
+    names = set()
+    for skill in skills:
+        offered, wanted = skill_tokens(skill)
+        names |= offered | wanted
+    tag_ids = get_tag_ids(names, tag_model=Tag)
+    rows = []
+    for skill in skills:
+        rows += skill_tag_rows(skill, tag_ids, skill_tag_model=SkillTag)
+    SkillTag.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0008_skilltoken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('offered', 'Offered'), ('wanted', 'Wanted')], max_length=10)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_tags', to='core.skill')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.DeleteModel(
+            name='SkillToken',
+        ),
+        migrations.AddField(
+            model_name='skilltag',
+            name='tag',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_tags', to='core.tag'),
+        ),
+        migrations.AddField(
+            model_name='skilltag',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_tags', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='tags',
+            field=models.ManyToManyField(blank=True, related_name='skills', through='core.SkillTag', to='core.tag'),
+        ),
+        migrations.AddIndex(
+            model_name='skilltag',
+            index=models.Index(fields=['role', 'tag', 'user'], name='skilltag_lookup_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='skilltag',
+            constraint=models.UniqueConstraint(fields=('skill', 'role', 'tag'), name='unique_skill_role_tag'),
+        ),
+        migrations.RunPython(populate_skill_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations
+
+from core import search
+
+
+def restore_search_index(apps, schema_editor):
+    # On SQLite, adding Skill.tags in 0009 rebuilt core_skill, which drops the
+    # FTS sync triggers with the old table; recreate them and resync
+    search.create_index(schema_editor.connection, rebuild=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_tags'),
+    ]
+
+    operations = [
+        migrations.RunPython(restore_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:24
+
+from django.db import migrations, models
+
+from core.geo import apply_geocode
+
+BATCH_SIZE = 500
+
+
+def geocode_locations(apps, schema_editor):
+    """Fill coordinates for existing skills and profiles from their location text"""
+    for model_name, fields in (
+        ('Skill', ['latitude', 'longitude', 'geo_cell']),
+        ('UserProfile', ['latitude', 'longitude']),
+    ):
+        model = apps.get_model('core', model_name)
+        rows = model.objects.exclude(location='').only('id', 'location').order_by('id')
+        batch = []
+        for row in rows.iterator(chunk_size=BATCH_SIZE):
+            apply_geocode(row)
+            if row.latitude is not None:
+                batch.append(row)
+            if len(batch) == BATCH_SIZE:
+                model.objects.bulk_update(batch, fields)
+                batch = []
+        model.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_restore_skill_search_triggers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skill',
+            name='geo_cell',
+            field=models.IntegerField(blank=True, help_text='Grid square id for radius search', null=True),
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['geo_cell', 'latitude'], name='skill_active_geo_idx'),
+        ),
+        migrations.RunPython(geocode_locations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:27
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def cancel_duplicate_pending(apps, schema_editor):
+    """Keep the oldest pending application per (skill, applicant), cancel the rest"""
+    SkillApplication = apps.get_model('core', 'SkillApplication')
+    duplicates = (
+        SkillApplication.objects.filter(status='pending')
+        .values('skill_id', 'applicant_id')
+        .annotate(count=Count('id'), keep=Min('id'))
+        .filter(count__gt=1)
+    )
+    for row in duplicates:
+        SkillApplication.objects.filter(
+            skill_id=row['skill_id'], applicant_id=row['applicant_id'], status='pending'
+        ).exclude(id=row['keep']).update(status='cancelled')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_skill_and_profile_coordinates'),
+    ]
+
+    operations = [
+        migrations.RunPython(cancel_duplicate_pending, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='skillapplication',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'pending')), fields=('skill', 'applicant'), name='unique_pending_application'),
+        ),
+    ]
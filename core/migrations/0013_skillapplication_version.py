@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_unique_pending_application'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skillapplication',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:31
+
+from django.db import migrations, models
+
+from core.applications import reconcile_counts
+
+
+def populate_counts(apps, schema_editor):
+    reconcile_counts(
+        skill_model=apps.get_model('core', 'Skill'),
+        application_model=apps.get_model('core', 'SkillApplication'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_skillapplication_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skill',
+            name='application_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='pending_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:52
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def copy_skill_owners(apps, schema_editor):
+    """Fill owner from the skill each existing application points at (null if it has none)"""
+    Skill = apps.get_model('core', 'Skill')
+    SkillApplication = apps.get_model('core', 'SkillApplication')
+    SkillApplication.objects.update(
+        owner_id=models.Subquery(Skill.objects.filter(id=models.OuterRef('skill_id')).values('user_id')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0014_skill_application_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skillapplication',
+            name='owner',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='applications_received', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(copy_skill_owners, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='skillapplication',
+            index=models.Index(fields=['owner', '-created_at'], name='application_inbox_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skillapplication',
+            index=models.Index(fields=['owner', 'status', '-created_at'], name='application_inbox_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skillapplication',
+            index=models.Index(fields=['applicant', 'status', '-created_at'], name='application_sent_status_idx'),
+        ),
+    ]
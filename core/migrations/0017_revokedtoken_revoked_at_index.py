@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_revokedtoken'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='revokedtoken',
+            index=models.Index(fields=['revoked_at'], name='revokedtoken_revoked_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+from django.db import migrations
+
+from core.matching import get_tag_ids, skill_tag_rows, skill_tokens
+
+BATCH_SIZE = 500
+
+
+def retag_skills(apps, schema_editor):
+    """
+    Re-derive every active skill's tags with the widened STOPWORDS and drop
+    the tags (filler words like 'from' or 'using') nothing links to any more
+    """
+    Skill = apps.get_model('core', 'Skill')
+    Tag = apps.get_model('core', 'Tag')
+    SkillTag = apps.get_model('core', 'SkillTag')
+    SkillTag.objects.all().delete()
+    skills = Skill.objects.filter(is_active=True, user__isnull=False).only(
+        'id', 'user_id', 'title', 'category', 'skills_wanted'
+    ).order_by('id')
+
+    batch = []
+    for skill in skills.iterator(chunk_size=BATCH_SIZE):
+        batch.append(skill)
+        if len(batch) == BATCH_SIZE:
+            tag_batch(batch, Tag, SkillTag)
+            batch = []
+    tag_batch(batch, Tag, SkillTag)
+    Tag.objects.filter(skill_tags__isnull=True).delete()
+
+
+def tag_batch(skills, Tag, SkillTag):
+    names = set()
+    for skill in skills:
+        offered, wanted = skill_tokens(skill)
+        names |= offered | wanted
+    tag_ids = get_tag_ids(names, tag_model=Tag)
+    rows = []
+    for skill in skills:
+        rows += skill_tag_rows(skill, tag_ids, skill_tag_model=SkillTag)
+    SkillTag.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_revokedtoken_revoked_at_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(retag_skills, migrations.RunPython.noop),
+    ]
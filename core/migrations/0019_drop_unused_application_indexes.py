@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:12
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_retag_skills'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='skillapplication',
+            name='application_skill_appl_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='skillapplication',
+            name='application_received_idx',
+        ),
+    ]
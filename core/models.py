@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 
 class Skill(models.Model):
@@ -33,13 +34,25 @@ class Skill(models.Model):
     # Location and availability
     location = models.CharField(max_length=255, blank=True, default='')
     availability = models.CharField(max_length=20, choices=AVAILABILITY_CHOICES, blank=True, default='')
+    # Geocoded from location against the bundled city table (see core.geo)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geo_cell = models.IntegerField(null=True, blank=True, help_text="Grid square id for radius search")
     
     # Skills wanted for exchange
     skills_wanted = models.TextField(blank=True, default='', help_text="Comma-separated list of skills wanted")
     
+    # Normalized tags derived from title/category (offered) and skills_wanted (wanted)
+    tags = models.ManyToManyField('Tag', through='SkillTag', related_name='skills', blank=True)
+    
     # User relationship
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='skills_offered', null=True)
     
+    # Denormalized from SkillApplication, kept current with F() updates in
+    # core.applications and repaired by manage.py reconcile_application_counts
+    application_count = models.PositiveIntegerField(default=0)
+    pending_count = models.PositiveIntegerField(default=0)
+    
     # Metadata
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -50,6 +63,29 @@ class Skill(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Public browse: active skills newest first, keyset on (created_at, id)
+            models.Index(
+                fields=['-created_at', '-id'],
+                condition=models.Q(is_active=True),
+                name='skill_active_created_idx',
+            ),
+            # Dashboard: a user's active skills newest first
+            models.Index(fields=['user', 'is_active', '-created_at'], name='skill_user_active_idx'),
+            models.Index(
+                fields=['category'],
+                condition=models.Q(is_active=True),
+                name='skill_active_category_idx',
+            ),
+            # Incremental refresh of the similar-skills model
+            models.Index(fields=['updated_at'], name='skill_updated_idx'),
+            # Nearest-skill search: grid cells covering the search radius
+            models.Index(
+                fields=['geo_cell', 'latitude'],
+                condition=models.Q(is_active=True),
+                name='skill_active_geo_idx',
+            ),
+        ]
 
 
 class SkillApplication(models.Model):
@@ -62,9 +98,18 @@ class SkillApplication(models.Model):
     
     skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='applications')
     applicant = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='applications_sent')
+    # skill.user, copied by core.signals so the received inbox is one index
+    # range scan instead of a join through every skill the owner has; null
+    # like Skill.user for skills without an owner
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True,
+        related_name='applications_received', editable=False
+    )
     message = models.TextField()
     offering_skill = models.CharField(max_length=200, blank=True, help_text="Skill offered in exchange")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    # Bumped by every status transition, clients may send it back for optimistic locking
+    version = models.PositiveIntegerField(default=1)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -73,12 +118,32 @@ class SkillApplication(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Sent applications newest first
+            models.Index(fields=['applicant', '-created_at'], name='application_sent_idx'),
+            # Received inbox newest first, optionally for one status
+            models.Index(fields=['owner', '-created_at'], name='application_inbox_idx'),
+            models.Index(fields=['owner', 'status', '-created_at'], name='application_inbox_status_idx'),
+            # Sent inbox for one status
+            models.Index(fields=['applicant', 'status', '-created_at'], name='application_sent_status_idx'),
+        ]
+        constraints = [
+            # At most one pending application per applicant and skill; apply_skill_api
+            # inserts and lets this reject the duplicate instead of checking first
+            models.UniqueConstraint(
+                fields=['skill', 'applicant'],
+                condition=models.Q(status='pending'),
+                name='unique_pending_application',
+            ),
+        ]
 
 
 class UserProfile(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     bio = models.TextField(blank=True)
     location = models.CharField(max_length=255, blank=True)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
     phone = models.CharField(max_length=20, blank=True)
     date_of_birth = models.DateField(null=True, blank=True)
     profile_picture = models.ImageField(upload_to='profiles/', null=True, blank=True)
@@ -89,3 +154,133 @@ class UserProfile(models.Model):
 
     def __str__(self):
         return self.user.username
+
+
+class OutboundEmail(models.Model):
+    """Outbox row written by the API and drained by the send_outbox command"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed')
+    ]
+    
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    html_body = models.TextField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    
+    # Delivery bookkeeping
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claim_token = models.CharField(max_length=32, blank=True, default='')
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.subject} to {self.to_email} ({self.status})"
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            # The worker polls for due pending rows
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
+
+
+class PendingNotification(models.Model):
+    """
+    A notification waiting to be coalesced into a per-recipient digest.
+    send_outbox turns each recipient's pending rows into one OutboundEmail
+    once the oldest is NOTIFICATION_DIGEST_WINDOW seconds old.
+    """
+    ACTION_CHOICES = [
+        ('accepted', 'Accepted'),
+        ('rejected', 'Rejected'),
+        ('message', 'Message')
+    ]
+    
+    to_email = models.EmailField()
+    to_name = models.CharField(max_length=150, blank=True, default='')
+    from_name = models.CharField(max_length=150, blank=True, default='')
+    skill_title = models.CharField(max_length=200, blank=True, default='')
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES, default='message')
+    message = models.TextField(blank=True, default='')
+    claim_token = models.CharField(max_length=32, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.action} for {self.to_email}"
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['to_email', 'created_at'], name='notification_recipient_idx'),
+        ]
+
+
+class Tag(models.Model):
+    """A normalized skill name, e.g. 'javascript' for 'JS', 'Javascript' or 'js'"""
+    name = models.CharField(max_length=64, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        ordering = ['name']
+
+
+class SkillTag(models.Model):
+    """
+    Skill <-> Tag link in the offered role (from the title and category) or
+    the wanted role (from skills_wanted). Rebuilt per skill on save by
+    core.signals; user is denormalized so matching can group by it straight
+    from the index.
+    """
+    ROLE_CHOICES = [
+        ('offered', 'Offered'),
+        ('wanted', 'Wanted')
+    ]
+    
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='skill_tags')
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='skill_tags')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='skill_tags')
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES)
+
+    def __str__(self):
+        return f"{self.skill_id} {self.role} {self.tag_id}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['skill', 'role', 'tag'], name='unique_skill_role_tag'),
+        ]
+        indexes = [
+            # tag -> users / skills lookups for one role
+            models.Index(fields=['role', 'tag', 'user'], name='skilltag_lookup_idx'),
+        ]
+
+
+class RevokedToken(models.Model):
+    """
+    A refresh token that may no longer be used (logout, or rotated out by
+    /token/refresh/). Only revoked tokens are stored, by jti, and rows can go
+    once the token has expired anyway; see core.tokens.
+    """
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField()
+    revoked_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.jti
+
+    class Meta:
+        indexes = [
+            # prune_revoked_tokens deletes expired rows oldest first
+            models.Index(fields=['expires_at'], name='revokedtoken_expiry_idx'),
+            # Blacklist.sync re-reads recent revocations by revoked_at
+            models.Index(fields=['revoked_at'], name='revokedtoken_revoked_idx'),
+        ]
@@ -0,0 +1,157 @@
+"""
+Email bodies for application notifications.
+
+Bodies are Django templates under templates/core/emails/, compiled once per
+process and autoescaped, so user supplied names and messages can't inject
+markup. With NOTIFICATION_DIGEST_WINDOW set, notifications are held as
+PendingNotification rows and coalesced into one email per recipient.
+"""
+import functools
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Min
+from django.template import loader
+from django.utils import timezone
+
+from .models import OutboundEmail, PendingNotification
+
+SUBJECTS = {
+    'accepted': "🎉 Your SkillHub Application for '{skill_title}' was Accepted!",
+    'rejected': "SkillHub Application Update for '{skill_title}'",
+    'message': "Message from {from_name} on SkillHub",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def get_email_template(name):
+    return loader.get_template(f'core/emails/{name}.html')
+
+
+def normalize_action(action):
+    return action if action in ('accepted', 'rejected') else 'message'
+
+
+def build_notification(action, to_name, from_name, skill_title, message_content):
+    """Return (subject, html) for an accepted/rejected/custom message email"""
+    action = normalize_action(action)
+    subject = SUBJECTS[action].format(skill_title=skill_title, from_name=from_name)
+    html_content = get_email_template(action).render({
+        'to_name': to_name,
+        'from_name': from_name,
+        'skill_title': skill_title,
+        'message': message_content,
+    })
+    return subject, html_content
+
+
+def build_digest(to_name, notifications):
+    """Return (subject, html) covering several notifications for one recipient"""
+    if len(notifications) == 1:
+        notification = notifications[0]
+        return build_notification(
+            notification.action, to_name, notification.from_name,
+            notification.skill_title, notification.message,
+        )
+
+    items = [
+        {
+            # The compiled partial, so the include doesn't go back to the loader
+            'partial': get_email_template(f'_{normalize_action(notification.action)}').template,
+            'skill_title': notification.skill_title,
+            'from_name': notification.from_name,
+            'message': notification.message,
+        }
+        for notification in notifications
+    ]
+    subject = f"You have {len(items)} updates on SkillHub"
+    return subject, get_email_template('digest').render({'to_name': to_name, 'items': items})
+
+
+def digest_window():
+    return getattr(settings, 'NOTIFICATION_DIGEST_WINDOW', 0)
+
+
+def record_notification(to_email, to_name, from_name, skill_title, action, message_content):
+    return PendingNotification.objects.create(
+        to_email=to_email,
+        to_name=to_name or '',
+        from_name=from_name or '',
+        skill_title=skill_title or '',
+        action=normalize_action(action),
+        message=message_content or '',
+    )
+
+
+def queue_notifications(notifications):
+    """
+    Queue several notifications (dicts with to_email, to_name, from_name,
+    skill_title, action, message) with one bulk insert: as pending digest
+    entries when NOTIFICATION_DIGEST_WINDOW is set, otherwise as outbox emails
+    """
+    if digest_window():
+        PendingNotification.objects.bulk_create([
+            PendingNotification(
+                to_email=item['to_email'],
+                to_name=item['to_name'] or '',
+                from_name=item['from_name'] or '',
+                skill_title=item['skill_title'] or '',
+                action=normalize_action(item['action']),
+                message=item['message'] or '',
+            )
+            for item in notifications
+        ])
+        return len(notifications)
+
+    emails = []
+    for item in notifications:
+        subject, html_content = build_notification(
+            item['action'], item['to_name'], item['from_name'], item['skill_title'], item['message']
+        )
+        emails.append(OutboundEmail(to_email=item['to_email'], subject=subject, html_body=html_content))
+    OutboundEmail.objects.bulk_create(emails)
+    return len(emails)
+
+
+def flush_digests(now=None):
+    """
+    Turn pending notifications into one OutboundEmail per recipient whose
+    oldest notification has waited a full digest window. Returns the number
+    of emails queued.
+
+    Claiming, queueing and deleting happen in one transaction; the claim is a
+    conditional UPDATE, so a second worker flushing at the same time claims
+    nothing instead of sending duplicates.
+    """
+    now = now or timezone.now()
+    cutoff = now - timedelta(seconds=digest_window())
+    recipients = list(
+        PendingNotification.objects.filter(claim_token='')
+        .values('to_email')
+        .annotate(oldest=Min('created_at'))
+        .filter(oldest__lte=cutoff)
+        .values_list('to_email', flat=True)
+    )
+    if not recipients:
+        return 0
+
+    token = uuid.uuid4().hex
+    with transaction.atomic():
+        PendingNotification.objects.filter(
+            to_email__in=recipients, claim_token='', created_at__lte=now
+        ).update(claim_token=token)
+        claimed = PendingNotification.objects.filter(claim_token=token).order_by('to_email', 'created_at')
+
+        grouped = {}
+        for notification in claimed:
+            grouped.setdefault(notification.to_email, []).append(notification)
+
+        emails = []
+        for to_email, notifications in grouped.items():
+            subject, html_content = build_digest(notifications[-1].to_name, notifications)
+            emails.append(OutboundEmail(to_email=to_email, subject=subject, html_body=html_content))
+        OutboundEmail.objects.bulk_create(emails)
+        PendingNotification.objects.filter(claim_token=token).delete()
+    return len(emails)
@@ -0,0 +1,101 @@
+"""
+Database-backed email outbox.
+
+API views call enqueue_email() and return straight away; the send_outbox
+management command claims due rows in batches and delivers them over one
+reused mail connection, retrying failures with exponential backoff.
+"""
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from .models import OutboundEmail
+
+
+def enqueue_email(to_email, subject, html_body):
+    return OutboundEmail.objects.create(to_email=to_email, subject=subject, html_body=html_body)
+
+
+def retry_delay(attempts):
+    """Exponential backoff after the given number of failed attempts"""
+    base = getattr(settings, 'OUTBOX_RETRY_BASE_SECONDS', 30)
+    cap = getattr(settings, 'OUTBOX_RETRY_MAX_SECONDS', 3600)
+    return timedelta(seconds=min(cap, base * 2 ** max(0, attempts - 1)))
+
+
+def claim_batch(batch_size):
+    """
+    Claim up to batch_size due rows for this worker.
+
+    Rows are tagged with a fresh claim token in one conditional UPDATE so two
+    workers never send the same message. Rows left in 'sending' by a crashed
+    worker become claimable again after OUTBOX_CLAIM_TIMEOUT seconds.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=getattr(settings, 'OUTBOX_CLAIM_TIMEOUT', 600))
+    due = Q(status='pending', next_attempt_at__lte=now) | Q(status='sending', claimed_at__lt=stale)
+    ids = list(
+        OutboundEmail.objects.filter(due).order_by('next_attempt_at', 'id').values_list('id', flat=True)[:batch_size]
+    )
+    if not ids:
+        return []
+
+    token = uuid.uuid4().hex
+    OutboundEmail.objects.filter(due, id__in=ids).update(
+        status='sending', claim_token=token, claimed_at=now
+    )
+    return list(OutboundEmail.objects.filter(claim_token=token, status='sending').order_by('id'))
+
+
+def build_message(email, connection):
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=strip_tags(email.html_body),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[email.to_email],
+        connection=connection,
+    )
+    message.attach_alternative(email.html_body, 'text/html')
+    return message
+
+
+def deliver_batch(emails, connection, max_attempts):
+    """
+    Send claimed emails over an already opened connection. Returns
+    (sent, failed) counts; failed rows are rescheduled or given up on.
+    """
+    sent = failed = 0
+    for email in emails:
+        email.attempts += 1
+        try:
+            if connection.send_messages([build_message(email, connection)]) != 1:
+                raise RuntimeError('Mail backend did not accept the message')
+        except Exception as e:
+            failed += 1
+            email.last_error = str(e)
+            if email.attempts >= max_attempts:
+                email.status = 'failed'
+            else:
+                email.status = 'pending'
+                email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+            # The SMTP session may be unusable now, reopen it for the next message
+            connection.close()
+            try:
+                connection.open()
+            except Exception:
+                pass
+        else:
+            sent += 1
+            email.status = 'sent'
+            email.sent_at = timezone.now()
+            email.last_error = ''
+        email.claim_token = ''
+        email.save(update_fields=[
+            'attempts', 'status', 'next_attempt_at', 'sent_at', 'last_error', 'claim_token'
+        ])
+    return sent, failed
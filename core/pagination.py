@@ -0,0 +1,84 @@
+import base64
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_cursor(created_at, pk):
+    """Pack a (created_at, id) position into an opaque URL-safe token"""
+    payload = json.dumps({'c': created_at.isoformat(), 'i': pk}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Unpack a token produced by encode_cursor, raising InvalidCursor on garbage"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        created_at = parse_datetime(payload['c'])
+        pk = int(payload['i'])
+    except (ValueError, TypeError, KeyError, UnicodeDecodeError, json.JSONDecodeError):
+        raise InvalidCursor(token)
+    if created_at is None:
+        raise InvalidCursor(token)
+    return created_at, pk
+
+
+def get_page_size(params):
+    """Read page_size from the query string, clamped to SKILLS_MAX_PAGE_SIZE"""
+    default = getattr(settings, 'SKILLS_PAGE_SIZE', 20)
+    maximum = getattr(settings, 'SKILLS_MAX_PAGE_SIZE', 100)
+    try:
+        page_size = int(params.get('page_size', default))
+    except (TypeError, ValueError):
+        page_size = default
+    return max(1, min(page_size, maximum))
+
+
+def approximate_count(queryset):
+    """
+    Count rows up to SKILLS_APPROX_COUNT_CAP instead of a full COUNT(*).
+    Returns (count, is_exact); once the cap is hit the count is a lower bound.
+    """
+    cap = getattr(settings, 'SKILLS_APPROX_COUNT_CAP', 1000)
+    count = queryset.order_by()[:cap + 1].count()
+    if count > cap:
+        return cap, False
+    return count, True
+
+
+def keyset_queryset(queryset, cursor=None):
+    """Order by (-created_at, -id) and seek past cursor when one is given"""
+    queryset = queryset.order_by('-created_at', '-id')
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        )
+    return queryset
+
+
+def paginate_keyset(queryset, params):
+    """
+    Keyset pagination over (-created_at, -id), matching Skill.Meta.ordering.
+
+    Each page is a single indexed range scan no matter how deep the client
+    has paged, unlike OFFSET which has to walk every skipped row.
+    """
+    page_size = get_page_size(params)
+    queryset = keyset_queryset(queryset, params.get('cursor'))
+
+    # Fetch one extra row to know whether another page exists
+    rows = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.pk)
+    return rows, next_cursor, page_size
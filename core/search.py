@@ -0,0 +1,181 @@
+"""
+Full-text search over Skill title/description/category/skills_wanted.
+
+SQLite uses an FTS5 table (core_skill_fts) kept in sync by triggers, Postgres
+uses a partial GIN index on a tsvector expression. Both are created by
+migration 0003. SQLite drops the triggers whenever a migration rebuilds
+core_skill, so core.signals restores them after every migrate. When neither
+is available the caller falls back to the old icontains filters.
+"""
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'core_skill_fts'
+PG_INDEX = 'core_skill_search_gin'
+PG_CONFIG = 'english'
+
+# The same expression is used by the GIN index and by queries, Postgres only
+# uses an expression index when the query expression matches it exactly.
+PG_DOCUMENT = (
+    f"to_tsvector('{PG_CONFIG}', coalesce(\"core_skill\".\"title\", '') || ' ' || "
+    "coalesce(\"core_skill\".\"category\", '') || ' ' || "
+    "coalesce(\"core_skill\".\"skills_wanted\", '') || ' ' || "
+    "coalesce(\"core_skill\".\"description\", ''))"
+)
+
+SQLITE_SETUP = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, description, category, skills_wanted, tokenize='unicode61 remove_diacritics 2')",
+    f"""CREATE TRIGGER IF NOT EXISTS core_skill_fts_ai AFTER INSERT ON core_skill
+    WHEN new.is_active BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, category, skills_wanted)
+        VALUES (new.id, new.title, new.description, new.category, new.skills_wanted);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS core_skill_fts_ad AFTER DELETE ON core_skill BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS core_skill_fts_au AFTER UPDATE ON core_skill BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+        INSERT INTO {FTS_TABLE}(rowid, title, description, category, skills_wanted)
+        SELECT new.id, new.title, new.description, new.category, new.skills_wanted
+        WHERE new.is_active;
+    END""",
+]
+
+SQLITE_TRIGGERS = {'core_skill_fts_ai', 'core_skill_fts_ad', 'core_skill_fts_au'}
+
+SQLITE_TEARDOWN = [
+    "DROP TRIGGER IF EXISTS core_skill_fts_ai",
+    "DROP TRIGGER IF EXISTS core_skill_fts_ad",
+    "DROP TRIGGER IF EXISTS core_skill_fts_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+PG_SETUP = [
+    f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON core_skill USING GIN ({PG_DOCUMENT}) WHERE is_active",
+]
+
+PG_TEARDOWN = [
+    f"DROP INDEX IF EXISTS {PG_INDEX}",
+]
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    """Split free text into word tokens safe to embed in a MATCH/tsquery string"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def create_index(conn, rebuild=False):
+    """Create (and optionally repopulate) the search index for conn's backend"""
+    with conn.cursor() as cursor:
+        if conn.vendor == 'sqlite':
+            for sql in SQLITE_SETUP:
+                cursor.execute(sql)
+            if rebuild:
+                cursor.execute(f"DELETE FROM {FTS_TABLE}")
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE}(rowid, title, description, category, skills_wanted) "
+                    "SELECT id, title, description, category, skills_wanted FROM core_skill WHERE is_active"
+                )
+        elif conn.vendor == 'postgresql':
+            if rebuild:
+                for sql in PG_TEARDOWN:
+                    cursor.execute(sql)
+            for sql in PG_SETUP:
+                cursor.execute(sql)
+
+
+def restore_triggers(conn):
+    """
+    Recreate the SQLite sync triggers, and resync the FTS table, when a
+    migration that rebuilt core_skill dropped them. A no-op while the FTS
+    table doesn't exist (migrated back past 0003) or on other backends.
+    """
+    if conn.vendor != 'sqlite' or FTS_TABLE not in conn.introspection.table_names():
+        return
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'core_skill'")
+        triggers = {row[0] for row in cursor.fetchall()}
+    if not SQLITE_TRIGGERS <= triggers:
+        create_index(conn, rebuild=True)
+
+
+def drop_index(conn):
+    with conn.cursor() as cursor:
+        if conn.vendor == 'sqlite':
+            for sql in SQLITE_TEARDOWN:
+                cursor.execute(sql)
+        elif conn.vendor == 'postgresql':
+            for sql in PG_TEARDOWN:
+                cursor.execute(sql)
+
+
+# Per-process memo of index_available(), keyed by connection alias
+_available = {}
+
+
+def index_available(conn=connection):
+    """True when the backend's search index exists in this database"""
+    if conn.alias not in _available:
+        if conn.vendor == 'sqlite':
+            _available[conn.alias] = FTS_TABLE in conn.introspection.table_names()
+        elif conn.vendor == 'postgresql':
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_indexes WHERE indexname = %s", [PG_INDEX])
+                _available[conn.alias] = cursor.fetchone() is not None
+        else:
+            _available[conn.alias] = False
+    return _available[conn.alias]
+
+
+def _icontains(skills, search):
+    return skills.filter(
+        Q(title__icontains=search) |
+        Q(description__icontains=search) |
+        Q(skills_wanted__icontains=search)
+    )
+
+
+def search_skills(skills, search):
+    """
+    Filter skills by a free-text search and annotate a search_rank (higher is
+    more relevant). Every token must match as a word prefix, which keeps
+    partially typed words working like the old substring search mostly did.
+    """
+    tokens = tokenize(search)
+    if not tokens or not index_available():
+        return _icontains(skills, search)
+
+    if connection.vendor == 'sqlite':
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        # bm25() is lower-is-better, negate it so both backends sort descending
+        return skills.filter(
+            id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+        ).annotate(
+            search_rank=RawSQL(
+                f"SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s AND rowid = \"core_skill\".\"id\"",
+                [match],
+                output_field=FloatField(),
+            )
+        )
+
+    query = ' & '.join(f'{token}:*' for token in tokens)
+    return skills.filter(
+        RawSQL(
+            f"{PG_DOCUMENT} @@ to_tsquery('{PG_CONFIG}', %s)",
+            [query],
+            output_field=BooleanField(),
+        )
+    ).annotate(
+        search_rank=RawSQL(
+            f"ts_rank_cd({PG_DOCUMENT}, to_tsquery('{PG_CONFIG}', %s))",
+            [query],
+            output_field=FloatField(),
+        )
+    )
@@ -1,9 +1,58 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db.models import QuerySet
 from django.contrib.auth import authenticate
 from .models import UserProfile, Skill, SkillApplication
 
 
+class EagerLoadingMixin:
+    """
+    Serializers declare the relations they read in select_related_fields /
+    prefetch_related_fields. Relations of nested EagerLoadingMixin serializers
+    are pulled in under their field's prefix, and any queryset handed to the
+    serializer with many=True gets them applied, so listings don't go N+1.
+    """
+    select_related_fields = ()
+    prefetch_related_fields = ()
+
+    @classmethod
+    def get_related_fields(cls):
+        select_related = list(cls.select_related_fields)
+        prefetch_related = list(cls.prefetch_related_fields)
+        for name, field in cls._declared_fields.items():
+            nested = getattr(field, 'child', field)
+            if not isinstance(nested, EagerLoadingMixin):
+                continue
+            prefix = (field.source or name).replace('.', '__')
+            nested_select, nested_prefetch = type(nested).get_related_fields()
+            if nested is field:
+                select_related.append(prefix)
+                select_related += [f'{prefix}__{related}' for related in nested_select]
+                prefetch_related += [f'{prefix}__{related}' for related in nested_prefetch]
+            else:
+                # A many=True nested serializer has to be prefetched
+                prefetch_related.append(prefix)
+                prefetch_related += [f'{prefix}__{related}' for related in nested_select + nested_prefetch]
+        return select_related, prefetch_related
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        select_related, prefetch_related = cls.get_related_fields()
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        if args and isinstance(args[0], QuerySet):
+            args = (cls.setup_eager_loading(args[0]),) + args[1:]
+        elif isinstance(kwargs.get('instance'), QuerySet):
+            kwargs['instance'] = cls.setup_eager_loading(kwargs['instance'])
+        return super().many_init(*args, **kwargs)
+
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -21,9 +70,9 @@ class UserProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserProfile
         fields = ('username', 'email', 'first_name', 'last_name', 'bio', 'location', 
-                 'phone', 'date_of_birth', 'profile_picture', 'is_mentor', 'rating', 
-                 'created_at', 'updated_at')
-        read_only_fields = ('rating', 'created_at', 'updated_at')
+                 'latitude', 'longitude', 'phone', 'date_of_birth', 'profile_picture',
+                 'is_mentor', 'rating', 'created_at', 'updated_at')
+        read_only_fields = ('latitude', 'longitude', 'rating', 'created_at', 'updated_at')
     
     def update(self, instance, validated_data):
         # Extract user data
@@ -83,22 +132,31 @@ class LoginSerializer(serializers.Serializer):
         return attrs
 
 
-class SkillSerializer(serializers.ModelSerializer):
+class SkillSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    select_related_fields = ('user',)
+    
     user = UserSerializer(read_only=True)
     username = serializers.CharField(source='user.username', read_only=True)
     user_email = serializers.CharField(source='user.email', read_only=True)
     
     class Meta:
         model = Skill
-        fields = '__all__'
-        read_only_fields = ('user', 'created_at', 'updated_at')
+        # tags are derived from the text fields on save; skills_wanted stays the readable form
+        exclude = ('tags', 'geo_cell')
+        read_only_fields = (
+            'user', 'latitude', 'longitude', 'application_count', 'pending_count',
+            'created_at', 'updated_at'
+        )
 
     def create(self, validated_data):
         validated_data['user'] = self.context['request'].user
         return super().create(validated_data)
 
 
-class SkillApplicationSerializer(serializers.ModelSerializer):
+class SkillApplicationSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    # skill and skill__user come from the nested SkillSerializer
+    select_related_fields = ('applicant',)
+    
     applicant = UserSerializer(read_only=True)
     skill = SkillSerializer(read_only=True)
     skill_title = serializers.CharField(source='skill.title', read_only=True)
@@ -107,8 +165,24 @@ class SkillApplicationSerializer(serializers.ModelSerializer):
     class Meta:
         model = SkillApplication
         fields = '__all__'
-        read_only_fields = ('applicant', 'created_at', 'updated_at')
+        read_only_fields = ('applicant', 'version', 'created_at', 'updated_at')
 
     def create(self, validated_data):
         validated_data['applicant'] = self.context['request'].user
-        return super().create(validated_data)
\ No newline at end of file
+        return super().create(validated_data)
+
+
+class CompactSkillApplicationSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    """Inbox rows with the skill's id and title instead of the nested skill"""
+    select_related_fields = ('applicant', 'skill')
+    
+    applicant = UserSerializer(read_only=True)
+    skill_title = serializers.CharField(source='skill.title', read_only=True)
+    
+    class Meta:
+        model = SkillApplication
+        fields = (
+            'id', 'skill', 'skill_title', 'owner', 'applicant', 'message', 'offering_skill',
+            'status', 'version', 'created_at', 'updated_at'
+        )
+        read_only_fields = fields
@@ -0,0 +1,73 @@
+from django.conf import settings
+from django.db import connections
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .caching import bump_auth_version, bump_catalogue_version, bump_user_skills_version
+from .geo import apply_geocode
+from .matching import index_skill
+from . import search
+from .models import Skill, SkillApplication, UserProfile
+from .typeahead import skill_deleted, skill_saved
+
+
+@receiver(pre_save, sender=Skill)
+@receiver(pre_save, sender=UserProfile)
+def geocode_location(sender, instance, **kwargs):
+    # A table lookup, cheap enough to redo on every save
+    apply_geocode(instance)
+
+
+@receiver(pre_save, sender=SkillApplication)
+def set_application_owner(sender, instance, **kwargs):
+    # A skill never changes hands, so this only matters on insert
+    if instance.owner_id is None:
+        instance.owner_id = instance.skill.user_id
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def skill_changed(sender, instance, **kwargs):
+    # Covers create in skills_api, PUT and soft-delete in skill_detail_api
+    # (is_active=False is a plain save) and admin edits
+    bump_catalogue_version()
+    if instance.user_id:
+        bump_user_skills_version(instance.user_id)
+
+
+@receiver(post_save, sender=Skill)
+def reindex_skill_tokens(sender, instance, **kwargs):
+    # Deletes cascade to SkillTag, so only saves need handling
+    index_skill(instance)
+
+
+@receiver(post_save, sender=Skill)
+def update_typeahead(sender, instance, **kwargs):
+    skill_saved(instance)
+
+
+@receiver(post_delete, sender=Skill)
+def remove_from_typeahead(sender, instance, **kwargs):
+    skill_deleted(instance.pk)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def user_changed(sender, instance, **kwargs):
+    # Drops the cached user core.authentication serves, covers deactivation
+    # and password changes too
+    bump_auth_version(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def profile_changed(sender, instance, **kwargs):
+    # The cached user carries the profile
+    bump_auth_version(instance.user_id)
+
+
+def restore_search_triggers(sender, using, **kwargs):
+    # Connected to post_migrate in CoreConfig.ready, so a Skill migration that
+    # makes SQLite rebuild core_skill needs no step of its own to put the FTS
+    # triggers back
+    search.restore_triggers(connections[using])
@@ -0,0 +1,185 @@
+"""
+Content-based "similar skills" over a TF-IDF model.
+
+The model (vectorizer, L2-normalized sparse document matrix and the skill id
+of every row) is persisted to SIMILAR_SKILLS_INDEX_PATH. Each worker loads it
+once; when the catalogue version moves (see core.caching) the worker pulls
+only the skills updated since the model's watermark, re-vectorizes them with
+the existing vocabulary and patches the matrix. Replaced and deactivated
+rows are tombstoned rather than removed, `manage.py rebuild_similar_skills`
+refits the vocabulary and compacts the matrix.
+"""
+import os
+import tempfile
+import threading
+
+import joblib
+import numpy as np
+from django.conf import settings
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from .caching import get_catalogue_version
+from .models import Skill
+
+DOCUMENT_FIELDS = ('id', 'title', 'description', 'category', 'skills_wanted', 'is_active', 'updated_at')
+
+
+def skill_document(skill):
+    # The title is repeated so it outweighs long descriptions
+    return ' '.join([
+        skill['title'], skill['title'], skill['category'],
+        skill['skills_wanted'], skill['description'],
+    ])
+
+
+def index_path():
+    return getattr(settings, 'SIMILAR_SKILLS_INDEX_PATH', settings.BASE_DIR / 'var' / 'similar_skills.joblib')
+
+
+class SimilarityIndex:
+    def __init__(self, vectorizer, matrix, ids, active, watermark):
+        self.vectorizer = vectorizer
+        self.matrix = matrix.tocsr()
+        self.ids = ids
+        self.active = active
+        self.watermark = watermark
+        self.version = None
+        self.row_of = {int(skill_id): row for row, skill_id in enumerate(ids) if active[row]}
+
+    @classmethod
+    def build(cls):
+        """Fit a fresh model over every active skill"""
+        skills = list(Skill.objects.filter(is_active=True).values(*DOCUMENT_FIELDS).order_by('id'))
+        watermark = max((skill['updated_at'] for skill in skills), default=None)
+        vectorizer = TfidfVectorizer(
+            stop_words='english', sublinear_tf=True, ngram_range=(1, 2),
+            max_features=getattr(settings, 'SIMILAR_SKILLS_MAX_FEATURES', 50000),
+        )
+        if skills:
+            matrix = vectorizer.fit_transform(skill_document(skill) for skill in skills)
+        else:
+            matrix = sparse.csr_matrix((0, 0))
+        ids = np.array([skill['id'] for skill in skills], dtype=np.int64)
+        return cls(vectorizer, matrix, ids, np.ones(len(ids), dtype=bool), watermark)
+
+    @classmethod
+    def load(cls, path):
+        state = joblib.load(path)
+        return cls(state['vectorizer'], state['matrix'], state['ids'], state['active'], state['watermark'])
+
+    def save(self, path):
+        # Write to a temp file and rename so readers never see a partial model
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        os.close(fd)
+        joblib.dump({
+            'vectorizer': self.vectorizer,
+            'matrix': self.matrix,
+            'ids': self.ids,
+            'active': self.active,
+            'watermark': self.watermark,
+        }, tmp_path)
+        os.replace(tmp_path, path)
+
+    @property
+    def fitted(self):
+        return hasattr(self.vectorizer, 'vocabulary_')
+
+    def apply_changes(self, skills):
+        """Tombstone the old rows of changed skills and append fresh ones"""
+        for skill in skills:
+            row = self.row_of.pop(skill['id'], None)
+            if row is not None:
+                self.active[row] = False
+            if self.watermark is None or skill['updated_at'] > self.watermark:
+                self.watermark = skill['updated_at']
+
+        live = [skill for skill in skills if skill['is_active']]
+        if not live:
+            return
+        rows = self.vectorizer.transform(skill_document(skill) for skill in live)
+        start = self.matrix.shape[0]
+        self.matrix = sparse.vstack([self.matrix, rows], format='csr')
+        self.ids = np.concatenate([self.ids, np.array([skill['id'] for skill in live], dtype=np.int64)])
+        self.active = np.concatenate([self.active, np.ones(len(live), dtype=bool)])
+        for offset, skill in enumerate(live):
+            self.row_of[skill['id']] = start + offset
+
+    def refresh(self):
+        """
+        Pick up skills saved since the watermark. Returns True when the model
+        changed. Skipped without a query while the catalogue version is unchanged.
+        """
+        version = get_catalogue_version()
+        if version == self.version:
+            return False
+        changed = Skill.objects.values(*DOCUMENT_FIELDS).order_by('updated_at')
+        if self.watermark is not None:
+            changed = changed.filter(updated_at__gt=self.watermark)
+        changed = list(changed)
+        self.version = version
+        if not changed:
+            return False
+        if not self.fitted:
+            # Built over an empty catalogue, there is no vocabulary to extend yet
+            self.__dict__.update(SimilarityIndex.build().__dict__)
+            self.version = version
+            return self.fitted
+        self.apply_changes(changed)
+        return True
+
+    def similar(self, skill_id, k):
+        """Top-k (skill id, cosine similarity) neighbours of a skill"""
+        row = self.row_of.get(skill_id)
+        if row is None or not self.fitted:
+            return []
+        # Rows are L2-normalized, so the dot product is the cosine similarity
+        scores = (self.matrix @ self.matrix[row].T).toarray().ravel()
+        scores[~self.active] = 0
+        scores[row] = 0
+        k = min(k, int(np.count_nonzero(scores)))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(self.ids[i]), float(scores[i])) for i in top]
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_index():
+    """The process-wide index, loaded from disk (or built) on first use"""
+    global _index
+    with _lock:
+        if _index is None:
+            path = index_path()
+            if os.path.exists(path):
+                _index = SimilarityIndex.load(path)
+            else:
+                _index = SimilarityIndex.build()
+                _index.save(path)
+        if _index.refresh():
+            _index.save(index_path())
+        return _index
+
+
+def rebuild_index():
+    global _index
+    with _lock:
+        _index = SimilarityIndex.build()
+        _index.save(index_path())
+        return _index
+
+
+def similar_skills(skill_id, k):
+    """Return [(Skill, score)] for the k most similar active skills"""
+    neighbours = get_index().similar(skill_id, k)
+    skills = Skill.objects.select_related('user').in_bulk([skill_id for skill_id, _ in neighbours])
+    return [
+        (skills[skill_id], score)
+        for skill_id, score in neighbours
+        if skill_id in skills and skills[skill_id].is_active
+    ]
@@ -0,0 +1,56 @@
+"""
+Incremental JSON for large list responses.
+
+With ?stream=1 a list endpoint returns a StreamingHttpResponse that reads
+rows through a server-side cursor (QuerySet.iterator) and serializes them
+one at a time, so neither the queryset, the serialized list nor the encoded
+body is ever held in memory whole. The bytes match what JSONRenderer would
+produce for the same data.
+"""
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+_encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def stream_chunk_size():
+    return getattr(settings, 'STREAM_CHUNK_SIZE', 500)
+
+
+def wants_stream(params):
+    return params.get('stream', '').lower() in ('1', 'true')
+
+
+def iter_representations(queryset, serializer_class, chunk_size=None):
+    """Yield the serialized form of each row, fetched chunk_size rows at a time"""
+    # One serializer instance for every row, the fields are only built once
+    serializer = serializer_class()
+    if hasattr(serializer_class, 'setup_eager_loading'):
+        queryset = serializer_class.setup_eager_loading(queryset)
+    for instance in queryset.iterator(chunk_size=chunk_size or stream_chunk_size()):
+        yield serializer.to_representation(instance)
+
+
+def iter_json_array(queryset, serializer_class):
+    yield '['
+    separator = ''
+    for data in iter_representations(queryset, serializer_class):
+        yield separator + _encoder.encode(data)
+        separator = ','
+    yield ']'
+
+
+def iter_json_object(members):
+    """Stream {"key": [...], ...} for an iterable of (key, queryset, serializer class)"""
+    yield '{'
+    separator = ''
+    for key, queryset, serializer_class in members:
+        yield f'{separator}{_encoder.encode(key)}:'
+        yield from iter_json_array(queryset, serializer_class)
+        separator = ','
+    yield '}'
+
+
+def streaming_json_response(chunks):
+    return StreamingHttpResponse(chunks, content_type='application/json')
@@ -0,0 +1,113 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.models import Skill, SkillApplication
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'applications'}}
+
+
+@override_settings(CACHES=LOCMEM)
+class ApplicationTransitionTests(TestCase):
+    """Status changes through /applications/<id>/status/ and /applications/bulk-status/"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com')
+        cls.applicant = User.objects.create_user('applicant', 'applicant@example.com')
+        cls.skill = Skill.objects.create(title='Guitar', description='Chords', user=cls.owner)
+
+    def setUp(self):
+        response = self.client_for(self.applicant).post(
+            '/apply/', {'skill_id': self.skill.id, 'message': 'Hi'}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.application = SkillApplication.objects.get(id=response.data['application']['id'])
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def set_status(self, user, new_status, **data):
+        return self.client_for(user).put(
+            f'/applications/{self.application.id}/status/', {'status': new_status, **data}, format='json'
+        )
+
+    def test_second_pending_application_rejected(self):
+        response = self.client_for(self.applicant).post(
+            '/apply/', {'skill_id': self.skill.id, 'message': 'Again'}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Already applied to this skill')
+        self.skill.refresh_from_db()
+        self.assertEqual((self.skill.application_count, self.skill.pending_count), (1, 1))
+
+    def test_owner_accepts_pending(self):
+        response = self.set_status(self.owner, 'accepted')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['application']['status'], 'accepted')
+        self.application.refresh_from_db()
+        self.assertEqual((self.application.status, self.application.version), ('accepted', 2))
+        self.skill.refresh_from_db()
+        self.assertEqual((self.skill.application_count, self.skill.pending_count), (1, 0))
+
+    def test_only_pending_applications_transition(self):
+        self.assertEqual(self.set_status(self.owner, 'rejected').status_code, 200)
+        response = self.set_status(self.owner, 'accepted')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['application']['status'], 'rejected')
+        self.assertEqual(self.set_status(self.applicant, 'cancelled').status_code, 409)
+
+    def test_applicant_cannot_accept(self):
+        response = self.set_status(self.applicant, 'accepted')
+        self.assertEqual(response.status_code, 403)
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.status, 'pending')
+
+    def test_applicant_cancels(self):
+        self.assertEqual(self.set_status(self.applicant, 'cancelled').status_code, 200)
+        self.assertEqual(self.set_status(self.owner, 'accepted').status_code, 409)
+
+    def test_unknown_status(self):
+        self.assertEqual(self.set_status(self.owner, 'archived').status_code, 400)
+
+    def test_stranger_gets_not_found(self):
+        stranger = User.objects.create_user('stranger', 'stranger@example.com')
+        self.assertEqual(self.set_status(stranger, 'accepted').status_code, 404)
+
+    def test_stale_version_conflicts(self):
+        response = self.set_status(self.owner, 'accepted', version=self.application.version + 1)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['application']['version'], self.application.version)
+        self.assertEqual(self.set_status(self.owner, 'accepted', version=self.application.version).status_code, 200)
+
+    def test_bulk_reports_conflicts_and_not_found(self):
+        other = User.objects.create_user('other', 'other@example.com')
+        second = SkillApplication.objects.create(skill=self.skill, applicant=other, message='Hi')
+        SkillApplication.objects.filter(id=second.id).update(status='cancelled')
+        someone_elses = SkillApplication.objects.create(
+            skill=Skill.objects.create(title='Piano', description='Scales', user=other),
+            applicant=self.applicant, message='Hi',
+        )
+
+        response = self.client_for(self.owner).post('/applications/bulk-status/', {'updates': [
+            {'id': self.application.id, 'status': 'accepted'},
+            {'id': second.id, 'status': 'rejected'},
+            {'id': someone_elses.id, 'status': 'accepted'},
+            {'id': 999999, 'status': 'rejected'},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['id'] for item in response.data['updated']], [self.application.id])
+        self.assertEqual(response.data['conflicts'], [
+            {'id': second.id, 'status': 'cancelled', 'error': 'Application is already cancelled'},
+        ])
+        self.assertEqual(sorted(response.data['not_found']), [someone_elses.id, 999999])
+        self.assertEqual(SkillApplication.objects.get(id=someone_elses.id).status, 'pending')
+
+    def test_bulk_rejects_applicant_statuses(self):
+        response = self.client_for(self.owner).post('/applications/bulk-status/', {'updates': [
+            {'id': self.application.id, 'status': 'cancelled'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,92 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from core.idempotency import idempotent
+from core.models import Skill, SkillApplication
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'idempotency'}}
+
+
+@override_settings(CACHES=LOCMEM)
+class IdempotencyKeyTests(TestCase):
+    """Idempotency-Key handling, through POST /apply/"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com')
+        cls.applicant = User.objects.create_user('applicant', 'applicant@example.com')
+        cls.skill = Skill.objects.create(title='Guitar', description='Chords', user=cls.owner)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.applicant)
+
+    def apply(self, key, message='Hi'):
+        return self.client.post(
+            '/apply/', {'skill_id': self.skill.id, 'message': message}, format='json',
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_retry_replays_stored_response(self):
+        first = self.apply('retry-1')
+        second = self.apply('retry-1')
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second.headers['Idempotent-Replayed'], 'true')
+        self.assertEqual(SkillApplication.objects.filter(applicant=self.applicant).count(), 1)
+
+    def test_reused_key_with_different_body(self):
+        self.assertEqual(self.apply('reused-1').status_code, 201)
+        response = self.apply('reused-1', message='Something else')
+        self.assertEqual(response.status_code, 422)
+
+    def test_new_key_runs_the_view(self):
+        self.assertEqual(self.apply('first').status_code, 201)
+        response = self.apply('second')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Already applied to this skill')
+
+    def test_overlong_key(self):
+        self.assertEqual(self.apply('k' * 256).status_code, 400)
+
+    def test_retry_while_in_flight(self):
+        factory = APIRequestFactory()
+        retries = []
+
+        def make_request():
+            request = factory.post('/echo/', {'n': 1}, format='json', HTTP_IDEMPOTENCY_KEY='in-flight')
+            force_authenticate(request, self.applicant)
+            return request
+
+        @api_view(['POST'])
+        @idempotent('echo')
+        def echo(request):
+            # The client retries before the first attempt has finished
+            if not retries:
+                retries.append(echo(make_request()))
+            return Response({'ok': True})
+
+        first = echo(make_request())
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(retries[0].status_code, 409)
+        self.assertEqual(echo(make_request()).headers['Idempotent-Replayed'], 'true')
+
+    def test_server_errors_are_not_stored(self):
+        factory = APIRequestFactory()
+        calls = []
+
+        @api_view(['POST'])
+        @idempotent('flaky')
+        def flaky(request):
+            calls.append(1)
+            return Response({'error': 'Try again'}, status=503 if len(calls) == 1 else 200)
+
+        for expected in (503, 200):
+            request = factory.post('/flaky/', {}, format='json', HTTP_IDEMPOTENCY_KEY='flaky-1')
+            force_authenticate(request, self.applicant)
+            self.assertEqual(flaky(request).status_code, expected)
+        self.assertEqual(len(calls), 2)
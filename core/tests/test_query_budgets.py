@@ -0,0 +1,104 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.caching import bump_auth_version, bump_catalogue_version, bump_user_skills_version
+from core.models import Skill, SkillApplication
+
+ROWS = 60
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'query-budgets'}})
+class QueryBudgetTests(TestCase):
+    """Every budgeted endpoint stays within its @query_budget on a seeded data set"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('budget-owner', 'owner@example.com')
+        applicants = User.objects.bulk_create(
+            User(username=f'budget-applicant-{i}', email=f'applicant{i}@example.com')
+            for i in range(ROWS)
+        )
+        skills = Skill.objects.bulk_create(
+            Skill(title=f'Budget skill {i}', description='seeded', user=cls.owner)
+            for i in range(ROWS // 10)
+        )
+        SkillApplication.objects.bulk_create(
+            SkillApplication(skill=skills[i % len(skills)], owner=cls.owner, applicant=applicant, message='seeded')
+            for i, applicant in enumerate(applicants)
+        )
+        # Give the first applicant a long sent list as well (they already
+        # have a pending application for skills[0])
+        SkillApplication.objects.bulk_create(
+            SkillApplication(skill=skill, owner=cls.owner, applicant=applicants[0], message='seeded')
+            for skill in skills[1:]
+        )
+        cls.applicant = applicants[0]
+        cls.skill = skills[0]
+
+    def setUp(self):
+        cache.clear()
+
+    def assertWithinBudget(self, path, user=None):
+        factory = APIRequestFactory()
+        headers = {}
+        if user is not None:
+            headers['HTTP_AUTHORIZATION'] = f'Bearer {RefreshToken.for_user(user).access_token}'
+        match = resolve(path.split('?')[0])
+        budget = getattr(match.func, 'query_budget', None)
+        self.assertIsNotNone(budget, f'{match.func.__name__} has no @query_budget')
+
+        # Warm-up call so per-process lookups don't count against the budget,
+        # then version bumps so the measured call misses the response caches
+        # and the cached authenticated user
+        match.func(factory.get(path, **headers), *match.args, **match.kwargs)
+        bump_catalogue_version()
+        if user is not None:
+            bump_user_skills_version(user.id)
+            bump_auth_version(user.id)
+        with CaptureQueriesContext(connection) as queries:
+            response = match.func(factory.get(path, **headers), *match.args, **match.kwargs)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(
+            len(queries), budget,
+            f'GET {path} ran {len(queries)} queries, budget {budget}:\n'
+            + '\n'.join(query['sql'] for query in queries.captured_queries),
+        )
+
+    def test_anonymous_endpoints(self):
+        for path in [
+            '/skills/',
+            '/skills/?page_size=50&include_total=1',
+            '/skills/?search=budget',
+            '/skills/autocomplete/?q=bud',
+        ]:
+            with self.subTest(path=path):
+                self.assertWithinBudget(path)
+
+    def test_owner_endpoints(self):
+        for path in [
+            '/my-skills/',
+            f'/skills/{self.skill.id}/',
+            '/my-applications/',
+            '/applications/received/?status=pending',
+            '/applications/received/?compact=1&page_size=100',
+            '/dashboard/',
+            '/dashboard/?received_status=pending&page_size=50',
+        ]:
+            with self.subTest(path=path):
+                self.assertWithinBudget(path, self.owner)
+
+    def test_applicant_endpoints(self):
+        for path in [
+            '/my-applications/',
+            '/applications/sent/',
+            '/dashboard/',
+        ]:
+            with self.subTest(path=path):
+                self.assertWithinBudget(path, self.applicant)
@@ -0,0 +1,91 @@
+import re
+import unittest
+
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from core.api_views import filter_skills
+from core.geo import bounding_cells
+from core.models import Skill, SkillApplication
+from core.pagination import encode_cursor, keyset_queryset
+
+
+# A bare "SCAN <table>" line (no USING INDEX / VIRTUAL TABLE) is a full table
+# scan; joined tables show up under Django's T<n> aliases
+FULL_SCAN_RE = re.compile(r'\bSCAN (core_\w+|T\d+)\s*$')
+TEMP_SORT = 'USE TEMP B-TREE FOR ORDER BY'
+
+# Paged browse queries must read rows in index order, a sort step means the
+# LIMIT can no longer stop early
+INDEX_ORDERED = {
+    'skills_api: browse',
+    'skills_api: browse page',
+    'skills_api: browse next page',
+    'sent_applications_api: status',
+    'received_applications_api',
+    'received_applications_api: next page',
+    'received_applications_api: status',
+}
+
+
+def endpoint_queries():
+    """
+    The hot queries each API endpoint runs, keyed by a readable label.
+    Parameter values are placeholders, the planner doesn't need real rows.
+    """
+    user_id = 1
+    active = Skill.objects.filter(is_active=True).select_related('user')
+    cursor = encode_cursor(timezone.now(), 1)
+    return {
+        'skills_api: browse': active,
+        'skills_api: browse page': keyset_queryset(active)[:21],
+        'skills_api: browse next page': keyset_queryset(active, cursor)[:21],
+        'skills_api: proficiency filter': filter_skills(active, {'proficiency': 'expert'}),
+        'skills_api: search': filter_skills(active, {'search': 'python'}),
+        'skills_api: wanted tag filter': filter_skills(active, {'wants': 'python, react'}),
+        'skills_api: offered tag filter': filter_skills(active, {'offers': 'guitar'}),
+        'skills_api: nearest candidates': active.order_by().filter(
+            geo_cell__in=bounding_cells(12.97, 77.59, 50), latitude__range=(12.5, 13.4)
+        ).values_list('pk', 'latitude', 'longitude'),
+        'my_skills_api': Skill.objects.filter(user_id=user_id, is_active=True),
+        'skill_detail_api': Skill.objects.filter(id=1, user_id=user_id),
+        'apply_skill_api: skill lookup': Skill.objects.filter(id=1, is_active=True),
+        'my_applications_api: sent': SkillApplication.objects.filter(
+            applicant_id=user_id
+        ).select_related('skill', 'skill__user'),
+        'my_applications_api: received': SkillApplication.objects.filter(
+            owner_id=user_id
+        ).select_related('applicant', 'skill'),
+        'sent_applications_api: status': keyset_queryset(
+            SkillApplication.objects.filter(applicant_id=user_id, status='pending')
+        )[:21],
+        'received_applications_api': keyset_queryset(SkillApplication.objects.filter(owner_id=user_id))[:21],
+        'received_applications_api: next page': keyset_queryset(
+            SkillApplication.objects.filter(owner_id=user_id), cursor
+        )[:21],
+        'received_applications_api: status': keyset_queryset(
+            SkillApplication.objects.filter(owner_id=user_id, status='pending')
+        )[:21],
+        'update_application_status_api': SkillApplication.objects.filter(
+            id=1, owner_id=user_id
+        ),
+    }
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'Query plans are checked with SQLite EXPLAIN QUERY PLAN')
+class QueryPlanTests(TestCase):
+    """No API endpoint query falls back to a full table scan or an unindexed sort"""
+
+    def test_endpoint_queries_use_indexes(self):
+        for label, queryset in endpoint_queries().items():
+            with self.subTest(label):
+                plan = queryset.explain()
+                scans = [
+                    match.group(1)
+                    for match in map(FULL_SCAN_RE.search, plan.splitlines())
+                    if match
+                ]
+                self.assertEqual(scans, [], f'full scan of {", ".join(scans)}:\n{plan}')
+                if label in INDEX_ORDERED:
+                    self.assertNotIn(TEMP_SORT, plan, f'sorts instead of reading index order:\n{plan}')
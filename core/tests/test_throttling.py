@@ -0,0 +1,57 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'throttling'}}
+RATES = {'login_ip': '3/min', 'login_username': '2/min', 'signup_ip': '2/hour', 'signup_username': '5/hour'}
+
+
+@override_settings(CACHES=LOCMEM, AUTH_THROTTLE_RATES=RATES)
+class AuthThrottleTests(TestCase):
+    """Token buckets on login and signup, checked before any password work"""
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user('member', 'member@example.com', 'secret-pass')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def login(self, username, ip='203.0.113.7'):
+        return self.client.post(
+            '/login/', {'username': username, 'password': 'wrong'}, format='json', REMOTE_ADDR=ip
+        )
+
+    @mock.patch('core.serializers.authenticate', return_value=None)
+    def test_username_bucket_runs_out(self, authenticate):
+        for _ in range(2):
+            self.assertEqual(self.login('member').status_code, 400)
+        response = self.login('Member', ip='198.51.100.1')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response.headers)
+        self.assertEqual(authenticate.call_count, 2)
+
+    @mock.patch('core.serializers.authenticate', return_value=None)
+    def test_ip_bucket_runs_out(self, authenticate):
+        for i in range(3):
+            self.assertEqual(self.login(f'user-{i}').status_code, 400)
+        self.assertEqual(self.login('user-3').status_code, 429)
+        self.assertEqual(authenticate.call_count, 3)
+        # Another client still gets through
+        self.assertEqual(self.login('user-4', ip='198.51.100.1').status_code, 400)
+
+    def test_spoofed_forwarded_for_shares_the_bucket(self):
+        # NUM_PROXIES=1: only the entry the proxy appended identifies the client
+        for i in range(3):
+            self.client.post(
+                '/signup/', {}, format='json',
+                HTTP_X_FORWARDED_FOR=f'10.0.0.{i}, 203.0.113.7', REMOTE_ADDR='10.1.1.1',
+            )
+        response = self.client.post(
+            '/signup/', {}, format='json', HTTP_X_FORWARDED_FOR='10.0.0.9, 203.0.113.7', REMOTE_ADDR='10.1.1.1'
+        )
+        self.assertEqual(response.status_code, 429)
@@ -0,0 +1,70 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import RevokedToken
+from core.tokens import Blacklist, RefreshToken, prune_expired
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tokens'}}
+
+
+@override_settings(CACHES=LOCMEM)
+class RefreshTokenRevocationTests(TestCase):
+    """Rotated and logged-out refresh tokens can't be used again"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('member', 'member@example.com', 'secret-pass')
+
+    def setUp(self):
+        cache.clear()
+        # A fresh filter per test, built from this test's rows
+        patcher = mock.patch('core.tokens.blacklist', Blacklist())
+        self.blacklist = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+
+    def refresh(self, token):
+        return self.client.post('/token/refresh/', {'refresh': token}, format='json')
+
+    def test_rotated_token_rejected(self):
+        token = str(RefreshToken.for_user(self.user))
+        response = self.refresh(token)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.refresh(token).status_code, 401)
+        self.assertEqual(self.refresh(response.data['refresh']).status_code, 200)
+
+    def test_logged_out_token_rejected(self):
+        token = RefreshToken.for_user(self.user)
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.post('/logout/', {'refresh': str(token)}, format='json').status_code, 200)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.refresh(str(token)).status_code, 401)
+
+    def test_revocation_by_another_worker(self):
+        token = RefreshToken.for_user(self.user)
+        self.assertFalse(self.blacklist.is_revoked(token['jti']))
+        # Another process revokes it and bumps the shared version
+        Blacklist().revoke(token['jti'], timezone.now() + timedelta(days=1))
+        self.assertTrue(self.blacklist.is_revoked(token['jti']))
+        self.assertEqual(self.refresh(str(token)).status_code, 401)
+
+
+class PruneExpiredTests(TestCase):
+    def test_deletes_only_expired_rows(self):
+        now = timezone.now()
+        RevokedToken.objects.bulk_create(
+            [RevokedToken(jti=f'expired-{i}', expires_at=now - timedelta(minutes=i + 1)) for i in range(5)]
+            + [RevokedToken(jti=f'live-{i}', expires_at=now + timedelta(days=1)) for i in range(3)]
+        )
+        self.assertEqual(prune_expired(batch_size=2), 5)
+        self.assertEqual(
+            sorted(RevokedToken.objects.values_list('jti', flat=True)),
+            ['live-0', 'live-1', 'live-2'],
+        )
+        self.assertEqual(prune_expired(), 0)
@@ -0,0 +1,118 @@
+"""
+Token-bucket throttling for the password endpoints.
+
+Login and signup hash a password on every call, so they are limited per
+client IP and per username before the view runs. Each bucket holds up to n
+tokens and refills at n per period (AUTH_THROTTLE_RATES, e.g. '10/min'), so
+a client can burst n requests and then keeps the average rate.
+
+Buckets live in the default cache so every worker shares them (with
+CACHE_URL). If that cache is unreachable the throttle carries on with
+per-process buckets instead of letting every request through or failing
+them all.
+"""
+import hashlib
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+_local_cache = LocMemCache('core-throttling', {'OPTIONS': {'MAX_ENTRIES': 10000}})
+
+
+def parse_rate(rate):
+    """'10/min' -> (10, 60)"""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period.strip()[0]]
+
+
+def take_token(key, capacity, period):
+    """
+    Spend one token from the bucket at key. Returns (allowed, seconds until
+    a token is available).
+    """
+    refill_per_second = capacity / period
+    now = time.time()
+    try:
+        store = cache
+        state = store.get(key)
+    except Exception:
+        logger.warning('Throttle cache unavailable, using per-process buckets', exc_info=True)
+        store = _local_cache
+        state = store.get(key)
+
+    tokens, updated_at = state or (capacity, now)
+    tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+    allowed = tokens >= 1
+    if allowed:
+        tokens -= 1
+    try:
+        # An untouched bucket is full again after one period, let it expire then
+        store.set(key, (tokens, now), period)
+    except Exception:
+        logger.warning('Throttle cache unavailable, using per-process buckets', exc_info=True)
+        _local_cache.set(key, (tokens, now), period)
+    return allowed, 0 if allowed else (1 - tokens) / refill_per_second
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Subclasses set scope (a key of AUTH_THROTTLE_RATES) and get_ident_key"""
+    scope = None
+
+    def get_ident_key(self, request):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        rate = getattr(settings, 'AUTH_THROTTLE_RATES', {}).get(self.scope)
+        ident = self.get_ident_key(request)
+        if not rate or not ident:
+            return True
+        capacity, period = parse_rate(rate)
+        digest = hashlib.sha1(ident.encode()).hexdigest()
+        allowed, self.wait_seconds = take_token(f'throttle:{self.scope}:{digest}', capacity, period)
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPThrottle(TokenBucketThrottle):
+    def get_ident_key(self, request):
+        # With REST_FRAMEWORK NUM_PROXIES set, DRF takes the X-Forwarded-For
+        # entry appended by the outermost trusted proxy, so spoofed entries
+        # in front of it don't buy a fresh bucket
+        return self.get_ident(request)
+
+
+class UsernameThrottle(TokenBucketThrottle):
+    def get_ident_key(self, request):
+        username = request.data.get('username') if hasattr(request.data, 'get') else None
+        return username.strip().lower() if isinstance(username, str) else None
+
+
+class LoginIPThrottle(IPThrottle):
+    scope = 'login_ip'
+
+
+class LoginUsernameThrottle(UsernameThrottle):
+    scope = 'login_username'
+
+
+class SignupIPThrottle(IPThrottle):
+    scope = 'signup_ip'
+
+
+class SignupUsernameThrottle(UsernameThrottle):
+    scope = 'signup_username'
+
+
+LOGIN_THROTTLES = [LoginIPThrottle, LoginUsernameThrottle]
+SIGNUP_THROTTLES = [SignupIPThrottle, SignupUsernameThrottle]
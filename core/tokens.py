@@ -0,0 +1,203 @@
+"""
+Refresh-token revocation without a database read per refresh.
+
+Revoked refresh tokens are stored by jti in RevokedToken. Each process also
+keeps a Bloom filter of those jtis: a token the filter has never seen is
+certainly not revoked, so only the rare hit (a revoked token or a false
+positive, TOKEN_BLACKLIST_ERROR_RATE of the rest) is confirmed against the
+table.
+
+The filter is built on first use from the unexpired rows. Revocations in this
+process are added straight away; ones made by other workers bump a version in
+the cache, and a changed version pulls the rows revoked since the last read,
+at most once per TOKEN_BLACKLIST_SYNC_SECONDS so a busy refresh endpoint
+doesn't turn every call into a read.
+
+Reads go by revoked_at rather than by id, but either way a row can commit
+after a later read has passed its timestamp. So every
+TOKEN_BLACKLIST_SYNC_SECONDS a catch-up read also looks back
+TOKEN_BLACKLIST_SYNC_OVERLAP_SECONDS before the previous one, which covers slow
+commits, clock skew between workers and a local-memory cache that never sees
+the other workers' versions.
+"""
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt import tokens as jwt_tokens
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .models import RevokedToken
+
+VERSION_KEY = 'auth:revoked-tokens-version'
+
+
+def bloom_capacity():
+    return getattr(settings, 'TOKEN_BLACKLIST_CAPACITY', 100000)
+
+
+def bloom_error_rate():
+    return getattr(settings, 'TOKEN_BLACKLIST_ERROR_RATE', 0.001)
+
+
+def sync_interval():
+    return getattr(settings, 'TOKEN_BLACKLIST_SYNC_SECONDS', 30)
+
+
+def sync_overlap():
+    return timedelta(seconds=getattr(settings, 'TOKEN_BLACKLIST_SYNC_OVERLAP_SECONDS', 300))
+
+
+class BloomFilter:
+    """Fixed-size set of strings with no false negatives"""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class Blacklist:
+    def __init__(self):
+        self.filter = None
+        # When the last read of the table started
+        self.watermark = None
+        self.version = None
+        # time.monotonic() of the last version-triggered read and catch-up read
+        self.synced_at = 0
+        self.caught_up_at = 0
+        self.lock = threading.Lock()
+
+    def _load(self, jtis):
+        for jti in jtis:
+            # Overlapping syncs see rows again, only count each jti once
+            if jti not in self.filter:
+                self.filter.add(jti)
+
+    def _read_since(self, revoked_after):
+        started = timezone.now()
+        self._load(RevokedToken.objects.filter(revoked_at__gte=revoked_after).values_list('jti', flat=True))
+        self.watermark = started
+
+    def rebuild(self):
+        """Fill a fresh filter, sized for the current rows, from every unexpired jti"""
+        self.watermark = timezone.now()
+        self.caught_up_at = time.monotonic()
+        rows = RevokedToken.objects.filter(expires_at__gt=self.watermark)
+        self.filter = BloomFilter(max(bloom_capacity(), rows.count() * 2), bloom_error_rate())
+        self._load(rows.order_by('id').values_list('jti', flat=True).iterator(chunk_size=2000))
+
+    def sync(self):
+        """
+        Build on first use. After that, pull rows revoked since the last read
+        when another worker bumped the version, and periodically catch up on
+        rows that committed late.
+        """
+        version = cache.get(VERSION_KEY)
+        now = time.monotonic()
+        catch_up = now - self.caught_up_at >= sync_interval()
+        changed = version != self.version and now - self.synced_at >= sync_interval()
+        if self.filter is not None and not catch_up and not changed:
+            return
+        with self.lock:
+            if self.filter is None or self.filter.count > self.filter.capacity:
+                self.rebuild()
+            elif catch_up:
+                self._read_since(self.watermark - sync_overlap())
+                self.caught_up_at = now
+            else:
+                self._read_since(self.watermark)
+                self.synced_at = now
+            self.version = version
+
+    def is_revoked(self, jti):
+        self.sync()
+        if jti not in self.filter:
+            return False
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def revoke(self, jti, expires_at):
+        try:
+            with transaction.atomic():
+                RevokedToken.objects.create(jti=jti, expires_at=expires_at)
+        except IntegrityError:
+            # Already revoked
+            return
+        self.sync()
+        with self.lock:
+            self.filter.add(jti)
+        try:
+            version = cache.incr(VERSION_KEY)
+        except ValueError:
+            version = 1
+            cache.set(VERSION_KEY, version, None)
+        # This worker's own revocation is already in the filter. Only skip
+        # the read it would trigger when nobody else bumped in between.
+        with self.lock:
+            if self.version is None or version == self.version + 1:
+                self.version = version
+
+
+blacklist = Blacklist()
+
+
+def prune_expired(batch_size=1000):
+    """
+    Delete revoked tokens that have expired anyway, batch_size rows per
+    statement so the table is never locked for long. Returns the number
+    deleted. Filters still holding their jtis only pay a lookup on a hit.
+    """
+    deleted = 0
+    now = timezone.now()
+    while True:
+        ids = list(
+            RevokedToken.objects.filter(expires_at__lte=now).order_by('expires_at')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += RevokedToken.objects.filter(id__in=ids).delete()[0]
+
+
+class RefreshToken(jwt_tokens.RefreshToken):
+    """simplejwt's RefreshToken, checked against and revocable into the blacklist"""
+
+    def verify(self, *args, **kwargs):
+        # Expiry and claims first, an expired token needn't be looked up
+        super().verify(*args, **kwargs)
+        if blacklist.is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_('Token is blacklisted'))
+
+    def blacklist(self):
+        blacklist.revoke(self.payload[api_settings.JTI_CLAIM], datetime_from_epoch(self.payload['exp']))
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    # Rotation calls blacklist() on the old token before issuing the new one
+    token_class = RefreshToken
@@ -0,0 +1,207 @@
+"""
+In-process prefix index for search-box autocomplete.
+
+Every active skill contributes its title, category and offered tags. Each
+suggestion is indexed under the start of every word it contains ("react
+native" is found by "rea" and by "nat") in one sorted list, so a lookup is a
+bisect plus a short scan and never touches the database. Suggestions are
+ranked by how many active skills share them.
+
+The index is built on first use in each worker. Saves in this worker patch
+it straight from core.signals; writes made elsewhere (other workers, bulk
+import) bump the catalogue version, and the next lookup pulls the skills
+updated since the index's watermark.
+"""
+import bisect
+import re
+import threading
+
+from django.conf import settings
+
+from .caching import get_catalogue_version
+from .matching import normalize_tokens
+from .models import Skill
+
+KINDS = ('title', 'category', 'tag')
+INDEX_FIELDS = ('id', 'title', 'category', 'is_active', 'updated_at')
+MAX_CACHED_RESULTS = 10000
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize(text):
+    return _WHITESPACE_RE.sub(' ', text.lower()).strip()
+
+
+def skill_suggestions(skill):
+    """(kind, display) pairs a skill row (dict) contributes while active"""
+    if not skill['is_active']:
+        return ()
+    pairs = {('title', skill['title'].strip()), ('category', skill['category'].strip())}
+    pairs |= {('tag', tag) for tag in normalize_tokens(f"{skill['title']} {skill['category']}")}
+    return tuple(sorted((kind, display) for kind, display in pairs if display))
+
+
+class PrefixIndex:
+    def __init__(self):
+        # Sorted (key, kind, normalized value) rows, one per word start
+        self.entries = []
+        # (kind, normalized value) -> [display, number of active skills]
+        self.suggestions = {}
+        # skill id -> the (kind, display) pairs it currently contributes
+        self.contributions = {}
+        # (prefix, limit) -> results; short prefixes scan many entries and are
+        # typed over and over, so answers are kept until the index changes
+        self.results = {}
+        self.watermark = None
+        self.version = None
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def _keys(value):
+        words = value.split(' ')
+        return {' '.join(words[i:]) for i in range(len(words))}
+
+    def _add(self, kind, display):
+        self.results.clear()
+        value = normalize(display)
+        suggestion = self.suggestions.get((kind, value))
+        if suggestion is not None:
+            suggestion[1] += 1
+            return
+        self.suggestions[(kind, value)] = [display, 1]
+        for key in self._keys(value):
+            bisect.insort(self.entries, (key, kind, value))
+
+    def _remove(self, kind, display):
+        self.results.clear()
+        value = normalize(display)
+        suggestion = self.suggestions.get((kind, value))
+        if suggestion is None:
+            return
+        suggestion[1] -= 1
+        if suggestion[1] > 0:
+            return
+        del self.suggestions[(kind, value)]
+        for key in self._keys(value):
+            i = bisect.bisect_left(self.entries, (key, kind, value))
+            if i < len(self.entries) and self.entries[i] == (key, kind, value):
+                del self.entries[i]
+
+    def update_skill(self, skill):
+        """Replace what a skill (dict with INDEX_FIELDS) contributes"""
+        with self.lock:
+            for kind, display in self.contributions.pop(skill['id'], ()):
+                self._remove(kind, display)
+            pairs = skill_suggestions(skill)
+            for kind, display in pairs:
+                self._add(kind, display)
+            if pairs:
+                self.contributions[skill['id']] = pairs
+
+    def remove_skill(self, skill_id):
+        with self.lock:
+            for kind, display in self.contributions.pop(skill_id, ()):
+                self._remove(kind, display)
+
+    def load(self, skills):
+        """Bulk build: count everything first, then sort the keys once"""
+        with self.lock:
+            for skill in skills:
+                pairs = skill_suggestions(skill)
+                for kind, display in pairs:
+                    value = normalize(display)
+                    self.suggestions.setdefault((kind, value), [display, 0])[1] += 1
+                if pairs:
+                    self.contributions[skill['id']] = pairs
+                if self.watermark is None or skill['updated_at'] > self.watermark:
+                    self.watermark = skill['updated_at']
+            self.entries = sorted(
+                (key, kind, value)
+                for kind, value in self.suggestions
+                for key in self._keys(value)
+            )
+
+    def refresh(self):
+        """Pull skills updated elsewhere once the catalogue version has moved"""
+        version = get_catalogue_version()
+        if version == self.version:
+            return
+        changed = Skill.objects.values(*INDEX_FIELDS).order_by('updated_at')
+        if self.watermark is not None:
+            changed = changed.filter(updated_at__gt=self.watermark)
+        with self.lock:
+            for skill in changed:
+                self.update_skill(skill)
+                # Only rows read here move the watermark: a save patched in
+                # from a signal says nothing about what other workers wrote
+                self.watermark = skill['updated_at']
+            self.version = version
+
+    def complete(self, prefix, limit):
+        """[{'value', 'kind', 'count'}] for suggestions with a word starting with prefix"""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        with self.lock:
+            cached = self.results.get((prefix, limit))
+            if cached is not None:
+                return cached
+            matches = set()
+            i = bisect.bisect_left(self.entries, (prefix,))
+            while i < len(self.entries) and self.entries[i][0].startswith(prefix):
+                matches.add(self.entries[i][1:])
+                i += 1
+            # Most used first; on a tie, whole-value prefix matches and shorter values
+            ranked = sorted(matches, key=lambda match: (
+                -self.suggestions[match][1], not match[1].startswith(prefix),
+                len(match[1]), match[1], KINDS.index(match[0]),
+            ))
+            results, seen = [], set()
+            for kind, value in ranked:
+                # A title and a tag spelling the same word are one suggestion
+                if value in seen:
+                    continue
+                seen.add(value)
+                display, count = self.suggestions[(kind, value)]
+                results.append({'value': display, 'kind': kind, 'count': count})
+                if len(results) == limit:
+                    break
+            if len(self.results) >= MAX_CACHED_RESULTS:
+                self.results.clear()
+            self.results[(prefix, limit)] = results
+            return results
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_index():
+    """The process-wide index, built on first use"""
+    global _index
+    with _lock:
+        if _index is None:
+            index = PrefixIndex()
+            version = get_catalogue_version()
+            index.load(Skill.objects.values(*INDEX_FIELDS).order_by('id').iterator(chunk_size=2000))
+            index.version = version
+            _index = index
+    _index.refresh()
+    return _index
+
+
+def skill_saved(skill):
+    """Patch the index from a save signal, if this worker has built it"""
+    if _index is not None:
+        _index.update_skill({field: getattr(skill, field) for field in INDEX_FIELDS})
+
+
+def skill_deleted(skill_id):
+    if _index is not None:
+        _index.remove_skill(skill_id)
+
+
+def autocomplete(prefix, limit=None):
+    limit = limit or getattr(settings, 'TYPEAHEAD_LIMIT', 10)
+    return get_index().complete(prefix, limit)
@@ -20,12 +20,23 @@ urlpatterns = [
     
     # API endpoints - Skills
     path('skills/', api_views.skills_api, name='api_skills'),
+    path('skills/autocomplete/', api_views.autocomplete_skills_api, name='api_autocomplete_skills'),
+    path('skills/facets/', api_views.skill_facets_api, name='api_skill_facets'),
+    path('skills/import/', api_views.import_skills_api, name='api_import_skills'),
+    path('skills/export/', api_views.export_skills_api, name='api_export_skills'),
     path('my-skills/', api_views.my_skills_api, name='api_my_skills'),
     path('skills/<int:skill_id>/', api_views.skill_detail_api, name='api_skill_detail'),
+    path('skills/<int:skill_id>/similar/', api_views.similar_skills_api, name='api_similar_skills'),
+    
+    path('matches/', api_views.swap_matches_api, name='api_swap_matches'),
+    path('dashboard/', api_views.dashboard_api, name='api_dashboard'),
     
     # API endpoints - Applications
     path('apply/', api_views.apply_skill_api, name='api_apply_skill'),
     path('my-applications/', api_views.my_applications_api, name='api_my_applications'),
+    path('applications/sent/', api_views.sent_applications_api, name='api_sent_applications'),
+    path('applications/received/', api_views.received_applications_api, name='api_received_applications'),
+    path('applications/bulk-status/', api_views.bulk_update_application_status_api, name='api_bulk_update_application_status'),
     path('applications/<int:application_id>/status/', api_views.update_application_status_api, name='api_update_application_status'),
     
     # API endpoints - Notifications
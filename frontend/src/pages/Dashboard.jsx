@@ -18,6 +18,16 @@ const Dashboard = () => {
     sent: []
   });
   const [loadingApplications, setLoadingApplications] = useState(false);
+  // Totals come from the dashboard counts, the lists only hold the pages loaded so far
+  const [applicationTotals, setApplicationTotals] = useState({
+    received: 0,
+    sent: 0
+  });
+  const [applicationCursors, setApplicationCursors] = useState({
+    received: null,
+    sent: null
+  });
+  const [loadingMore, setLoadingMore] = useState(null);
   const [showMessageModal, setShowMessageModal] = useState(false);
   const [selectedApplication, setSelectedApplication] = useState(null);
   const [customMessage, setCustomMessage] = useState('');
@@ -35,25 +45,30 @@ const Dashboard = () => {
   });
 
   useEffect(() => {
-    // Load user's skills and applications
-    loadMySkills();
-    loadApplications();
+    // Load user's skills and applications in one round trip
+    loadDashboard();
   }, []);
 
-  const loadApplications = async () => {
+  const loadDashboard = async () => {
     try {
       setLoadingApplications(true);
-      const applicationsData = await skillsApi.getMyApplications();
-      console.log('Loaded applications:', applicationsData);
-      
-      // Set real applications data
+      const dashboard = await skillsApi.getDashboard();
+      setMySkills(Array.isArray(dashboard.skills) ? dashboard.skills : []);
       setApplications({
-        received: Array.isArray(applicationsData.received) ? applicationsData.received : [],
-        sent: Array.isArray(applicationsData.sent) ? applicationsData.sent : []
+        received: Array.isArray(dashboard.received?.results) ? dashboard.received.results : [],
+        sent: Array.isArray(dashboard.sent?.results) ? dashboard.sent.results : []
+      });
+      setApplicationTotals({
+        received: dashboard.counts?.received?.total ?? 0,
+        sent: dashboard.counts?.sent?.total ?? 0
+      });
+      setApplicationCursors({
+        received: dashboard.received?.next_cursor ?? null,
+        sent: dashboard.sent?.next_cursor ?? null
       });
     } catch (error) {
-      console.error('Failed to load applications:', error);
-      // Set empty arrays if API fails
+      console.error('Failed to load dashboard:', error);
+      setMySkills([]);
       setApplications({
         received: [],
         sent: []
@@ -63,6 +78,30 @@ const Dashboard = () => {
     }
   };
 
+  // kind is 'received' or 'sent'; fetches the next page of that list only
+  const loadMoreApplications = async (kind) => {
+    const cursor = applicationCursors[kind];
+    if (!cursor) return;
+    try {
+      setLoadingMore(kind);
+      // One page of one inbox, not the whole dashboard again
+      const fetchPage = kind === 'sent' ? skillsApi.getSentApplications : skillsApi.getReceivedApplications;
+      const page = (await fetchPage({ cursor })) || {};
+      setApplications(prev => ({
+        ...prev,
+        [kind]: [...prev[kind], ...(Array.isArray(page.results) ? page.results : [])]
+      }));
+      setApplicationCursors(prev => ({
+        ...prev,
+        [kind]: page.next_cursor ?? null
+      }));
+    } catch (error) {
+      console.error(`Failed to load more ${kind} applications:`, error);
+    } finally {
+      setLoadingMore(null);
+    }
+  };
+
   const loadMySkills = async () => {
     try {
       const skills = await skillsApi.getMySkills();
@@ -377,8 +416,8 @@ const Dashboard = () => {
                       : 'bg-gray-700/50 text-cyan-300 hover:bg-gray-600/50 border border-gray-600/50'
                   }`}
                 >
-                  <span className="hidden sm:inline">Applications Received ({applications.received.length})</span>
-                  <span className="sm:hidden">Received ({applications.received.length})</span>
+                  <span className="hidden sm:inline">Applications Received ({applicationTotals.received})</span>
+                  <span className="sm:hidden">Received ({applicationTotals.received})</span>
                 </button>
                 <button
                   onClick={() => setActiveTab('sent')}
@@ -388,8 +427,8 @@ const Dashboard = () => {
                       : 'bg-gray-700/50 text-cyan-300 hover:bg-gray-600/50 border border-gray-600/50'
                   }`}
                 >
-                  <span className="hidden sm:inline">Applications Sent ({applications.sent.length})</span>
-                  <span className="sm:hidden">Sent ({applications.sent.length})</span>
+                  <span className="hidden sm:inline">Applications Sent ({applicationTotals.sent})</span>
+                  <span className="sm:hidden">Sent ({applicationTotals.sent})</span>
                 </button>
                 <button
                   onClick={() => setActiveTab('mySkills')}
@@ -512,6 +551,17 @@ const Dashboard = () => {
                       </div>
                     ))
                   )}
+                  {applicationCursors.received && (
+                    <div className="text-center">
+                      <button
+                        onClick={() => loadMoreApplications('received')}
+                        disabled={loadingMore === 'received'}
+                        className="border border-cyan-400/50 text-cyan-300 hover:bg-cyan-500/20 px-4 py-2 rounded-lg transition duration-300 disabled:opacity-50"
+                      >
+                        {loadingMore === 'received' ? 'Loading...' : 'Load more'}
+                      </button>
+                    </div>
+                  )}
                 </div>
               )}
 
@@ -567,6 +617,17 @@ const Dashboard = () => {
                       </div>
                     ))
                   )}
+                  {applicationCursors.sent && (
+                    <div className="text-center">
+                      <button
+                        onClick={() => loadMoreApplications('sent')}
+                        disabled={loadingMore === 'sent'}
+                        className="border border-purple-400/50 text-purple-300 hover:bg-purple-500/20 px-4 py-2 rounded-lg transition duration-300 disabled:opacity-50"
+                      >
+                        {loadingMore === 'sent' ? 'Loading...' : 'Load more'}
+                      </button>
+                    </div>
+                  )}
                 </div>
               )}
 
@@ -43,12 +43,27 @@ const skillsApi = {
     if (filters.category) queryParams.append('category', filters.category);
     if (filters.location) queryParams.append('location', filters.location);
     if (filters.proficiency) queryParams.append('proficiency', filters.proficiency);
+    if (filters.availability) queryParams.append('availability', filters.availability);
     if (filters.search) queryParams.append('search', filters.search);
     
     const endpoint = `/skills/${queryParams.toString() ? '?' + queryParams.toString() : ''}`;
     return await apiRequest(endpoint);
   },
 
+  // Get per-category/proficiency/availability counts for the same filters
+  getSkillFacets: async (filters = {}) => {
+    const queryParams = new URLSearchParams();
+    
+    if (filters.category) queryParams.append('category', filters.category);
+    if (filters.location) queryParams.append('location', filters.location);
+    if (filters.proficiency) queryParams.append('proficiency', filters.proficiency);
+    if (filters.availability) queryParams.append('availability', filters.availability);
+    if (filters.search) queryParams.append('search', filters.search);
+    
+    const endpoint = `/skills/facets/${queryParams.toString() ? '?' + queryParams.toString() : ''}`;
+    return await apiRequest(endpoint);
+  },
+
   // Create a new skill
   createSkill: async (skillData) => {
     return await apiRequest('/skills/', {
@@ -57,6 +72,13 @@ const skillsApi = {
     });
   },
 
+  // Skills, first page of sent/received applications, status counts and profile in one call
+  getDashboard: async (params = {}) => {
+    const queryParams = new URLSearchParams(params);
+    const endpoint = `/dashboard/${queryParams.toString() ? '?' + queryParams.toString() : ''}`;
+    return await apiRequest(endpoint);
+  },
+
   // Get current user's skills
   getMySkills: async () => {
     return await apiRequest('/my-skills/');
@@ -90,6 +112,17 @@ const skillsApi = {
     return await apiRequest('/my-applications/');
   },
 
+  // One page of sent/received applications; params: status, cursor, page_size, compact
+  getSentApplications: async (params = {}) => {
+    const queryParams = new URLSearchParams(params);
+    return await apiRequest(`/applications/sent/${queryParams.toString() ? '?' + queryParams.toString() : ''}`);
+  },
+
+  getReceivedApplications: async (params = {}) => {
+    const queryParams = new URLSearchParams(params);
+    return await apiRequest(`/applications/received/${queryParams.toString() ? '?' + queryParams.toString() : ''}`);
+  },
+
   // Update application status
   updateApplicationStatus: async (applicationId, status) => {
     return await apiRequest(`/applications/${applicationId}/status/`, {
@@ -5,9 +5,12 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
 
+from core.throttling import LOGIN_THROTTLES
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('core.urls')),
-    path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    # Checks passwords like login_api, so it shares login's throttles
+    path('token/', TokenObtainPairView.as_view(throttle_classes=LOGIN_THROTTLES), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
 ]